@@ -1,44 +1,114 @@
-import streamlit as st
-import pandas as pd
-from linkedin_scraper import scrape_linkedin_profiles
-
-st.set_page_config(page_title="LinkedIn Sourcing Agent", layout="wide")
-
-st.title("🔎 LinkedIn Sourcing Agent Dashboard")
-
-# Sidebar Inputs
-st.sidebar.header("Search Parameters")
-job_role = st.sidebar.text_input("Job Role / Keywords", "Data Scientist")
-num_profiles = st.sidebar.slider("Number of Profiles to Fetch", 1, 20, 5)
-
-# Run Scraper Button
-if st.sidebar.button("Run Sourcing Agent"):
-    with st.spinner('Scraping LinkedIn profiles...'):
-        df = scrape_linkedin_profiles(job_role, num_profiles)
-        st.success(f"Scraped {len(df)} profiles successfully!")
-
-# Display Data Table if CSV exists
-try:
-    df = pd.read_csv("profiles.csv")
-    st.subheader("👥 Candidate Profiles")
-    st.dataframe(df, use_container_width=True)
-
-    # Download Button
-    csv = df.to_csv(index=False).encode('utf-8')
-    st.download_button(
-        label="📥 Download CSV",
-        data=csv,
-        file_name='linkedin_profiles.csv',
-        mime='text/csv',
-    )
-
-    # Search Functionality
-    st.subheader("🔍 Filter Profiles")
-    search_term = st.text_input("Search by Name / Title / Location")
-    if search_term:
-        filtered_df = df[df.apply(lambda row: search_term.lower() in row.to_string().lower(), axis=1)]
-        st.write(filtered_df)
-
-except FileNotFoundError:
-    st.info("👉 Run the sourcing agent to fetch profiles.")
-
+import io
+import os
+import time
+
+import streamlit as st
+import pandas as pd
+from linkedin_scraper import scrape_linkedin_profiles
+
+PROFILES_CSV = "profiles.csv"
+CACHE_TTL = int(os.getenv("CACHE_TTL", "3600"))
+PAGE_SIZE = 200
+
+st.set_page_config(page_title="LinkedIn Sourcing Agent", layout="wide")
+
+st.title("🔎 LinkedIn Sourcing Agent Dashboard")
+
+
+def shrink_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Downcast numeric columns and turn repetitive text columns into categories"""
+    for col in df.columns:
+        series = df[col]
+        if series.dtype == object:
+            if len(df) and series.nunique() / len(df) < 0.5:
+                df[col] = series.astype("category")
+        elif pd.api.types.is_integer_dtype(series):
+            df[col] = pd.to_numeric(series, downcast="integer")
+        elif pd.api.types.is_float_dtype(series):
+            df[col] = pd.to_numeric(series, downcast="float")
+    return df
+
+
+@st.cache_data
+def load_profiles(mtime: float) -> pd.DataFrame:
+    """Load the scraped profiles, re-reading only when the CSV changes"""
+    return shrink_dtypes(pd.read_csv(PROFILES_CSV, engine="pyarrow"))
+
+
+# The helpers below are keyed on `source`, which identifies the profiles shown;
+# the underscore-prefixed DataFrame argument is not hashed by st.cache_data
+
+@st.cache_data
+def csv_bytes(source: tuple, _df: pd.DataFrame) -> bytes:
+    """UTF-8 encoded CSV payload for the download button"""
+    buf = io.BytesIO()
+    _df.to_csv(buf, index=False, encoding='utf-8')
+    return buf.getvalue()
+
+
+@st.cache_data
+def search_haystack(source: tuple, _df: pd.DataFrame) -> pd.Series:
+    """Lowercased row text used by the profile filter"""
+    return _df.astype(str).agg(" ".join, axis=1).str.lower()
+
+
+@st.cache_data(max_entries=64)
+def search_mask(source: tuple, term: str, _df: pd.DataFrame) -> pd.Series:
+    """Boolean row mask for a search term, cached so repeated terms skip the scan"""
+    return search_haystack(source, _df).str.contains(term, regex=False, na=False)
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner="Scraping LinkedIn profiles...")
+def cached_scrape(job_role: str, num_profiles: int) -> pd.DataFrame:
+    """Scrape profiles, reusing recent results for the same search parameters"""
+    return scrape_linkedin_profiles(job_role, num_profiles)
+
+
+# Sidebar Inputs
+st.sidebar.header("Search Parameters")
+job_role = st.sidebar.text_input("Job Role / Keywords", "Data Scientist")
+num_profiles = st.sidebar.slider("Number of Profiles to Fetch", 1, 20, 5)
+
+# Run Scraper Button
+if st.sidebar.button("Run Sourcing Agent"):
+    df = cached_scrape(job_role, num_profiles)
+    # Show this search's results directly: a cache hit skips the scraper, so
+    # profiles.csv may still hold a different search
+    st.session_state["profiles"] = shrink_dtypes(df)
+    st.session_state["profiles_source"] = ("search", job_role, num_profiles, time.time())
+    st.success(f"Scraped {len(df)} profiles successfully!")
+
+# Display the latest search, or the scraper's CSV if it exists
+try:
+    if "profiles" in st.session_state:
+        source = st.session_state["profiles_source"]
+        df = st.session_state["profiles"]
+    else:
+        source = ("csv", os.path.getmtime(PROFILES_CSV))
+        df = load_profiles(source[1])
+    st.subheader("👥 Candidate Profiles")
+
+    # Only ship one page of rows to the browser at a time
+    last_page = max((len(df) - 1) // PAGE_SIZE, 0)
+    page = st.number_input("Page", min_value=1, max_value=last_page + 1, value=1, step=1) - 1
+    st.caption(f"Showing rows {page * PAGE_SIZE + 1}-{min((page + 1) * PAGE_SIZE, len(df))} of {len(df)}")
+    st.dataframe(df.iloc[page * PAGE_SIZE:(page + 1) * PAGE_SIZE], use_container_width=True)
+
+    # Download Button
+    st.download_button(
+        label="📥 Download CSV",
+        data=csv_bytes(source, df),
+        file_name='linkedin_profiles.csv',
+        mime='text/csv',
+    )
+
+    # Search Functionality
+    st.subheader("🔍 Filter Profiles")
+    search_term = st.text_input("Search by Name / Title / Location")
+    if search_term:
+        filtered_df = df[search_mask(source, search_term.lower(), df)]
+        st.write(filtered_df)
+
+except FileNotFoundError:
+    st.info("👉 Run the sourcing agent to fetch profiles.")
+
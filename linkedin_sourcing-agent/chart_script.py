@@ -1,4 +1,6 @@
 import plotly.graph_objects as go
+import numpy as np
+import pandas as pd
 import json
 
 # Parse the data
@@ -16,24 +18,25 @@ data_json = {"hackathon_scoring_data": [
 
 scoring_data = data_json["hackathon_scoring_data"]
 
-# Extract data and calculate percentages
-criteria = [item["criteria"] for item in scoring_data]
-achieved = [item["achieved"] for item in scoring_data]
-maximum = [item["maximum"] for item in scoring_data]
-percentages = [(a/m)*100 for a, m in zip(achieved, maximum)]
+# Extract data and calculate percentages in one vectorized pass
+df = pd.DataFrame(scoring_data)
+criteria = df["criteria"]
+achieved = df["achieved"].to_numpy()
+maximum = df["maximum"].to_numpy()
+percentages = achieved / maximum * 100
 
 # Determine colors based on percentage ranges using green, yellow, red
-colors = []
-for pct in percentages:
-    if pct >= 90:
-        colors.append('#28a745')  # Green for scores >= 90%
-    elif pct >= 70:
-        colors.append('#ffc107')  # Yellow for scores 70-89%
-    else:
-        colors.append('#dc3545')  # Red for scores < 70%
+colors = np.select(
+    [percentages >= 90, percentages >= 70],
+    ['#28a745', '#ffc107'],  # Green for scores >= 90%, yellow for 70-89%
+    default='#dc3545'  # Red for scores < 70%
+)
 
 # Create text labels showing achieved/maximum (percentage%)
-text_labels = [f"{a}/{m} ({p:.0f}%)" for a, m, p in zip(achieved, maximum, percentages)]
+text_labels = (
+    df["achieved"].astype(str) + "/" + df["maximum"].astype(str)
+    + " (" + pd.Series(percentages).round().astype(int).astype(str) + "%)"
+)
 
 # Create horizontal bar chart
 fig = go.Figure()
@@ -6,6 +6,7 @@ Manages all configuration settings for the AI Sourcing Agent.
 """
 
 import os
+from functools import lru_cache
 from typing import Optional
 from dotenv import load_dotenv
 
@@ -58,3 +59,8 @@ class Config:
     def has_google(self) -> bool:
         """Check if Google API is available"""
         return bool(self.google_api_key)
+
+@lru_cache(maxsize=1)
+def get_config() -> Config:
+    """Return the process-wide configuration, parsing the environment once"""
+    return Config()
@@ -0,0 +1,28 @@
+"""
+Test Configuration
+==================
+
+Shared pytest fixtures for the AI Sourcing Agent test suite.
+"""
+
+import socket
+import pytest
+
+collect_ignore = ["build", "dist", ".venv"]
+
+_LOCAL_HOSTS = {"127.0.0.1", "::1", "localhost"}
+
+@pytest.fixture(autouse=True)
+def _block_network(request, monkeypatch):
+    """Fail fast on outbound connections unless a test is marked `network`"""
+    if request.node.get_closest_marker("network"):
+        return
+
+    real_connect = socket.socket.connect
+
+    def guarded_connect(sock, address):
+        if sock.family == getattr(socket, "AF_UNIX", None) or address[0] in _LOCAL_HOSTS:
+            return real_connect(sock, address)
+        raise ConnectionRefusedError(f"Network access is blocked in tests: {address}")
+
+    monkeypatch.setattr(socket.socket, "connect", guarded_connect)
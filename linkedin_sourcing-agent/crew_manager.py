@@ -7,23 +7,83 @@ to perform comprehensive supplier sourcing and evaluation.
 """
 
 import asyncio
-from typing import List, Dict, Any, Optional
-from crewai import Agent, Task, Crew, Process
-from crewai_tools import SerperDevTool, ScrapeWebsiteTool
-from langchain_openai import ChatOpenAI
-from langchain_google_genai import ChatGoogleGenerativeAI
+import copy
+import functools
+import threading
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
+import orjson
+import redis
 
 from .agents.sourcing_researcher import SourcingResearcher
 from .agents.supplier_analyst import SupplierAnalyst  
 from .agents.risk_assessor import RiskAssessor
 from .agents.report_generator import ReportGenerator
-from .tools.web_search import WebSearchTool
-from .tools.supplier_database import SupplierDatabaseTool
-from .tools.compliance_checker import ComplianceCheckerTool
-from .utils.config import Config
-from .utils.logger import setup_logger
+from .utils.config import get_config
+from .utils.llm_cache import LLMCache, cached_call
+from .utils.semantic_cache import SemanticCache
+from .utils.logger import setup_logger, get_trace_logger
+
+# Prefer the linear-time RE2 engine for scanning long LLM outputs
+try:
+    import re2 as regex
+except ImportError:
+    import re as regex
+
+# crewai / langchain pull in hundreds of modules; they are imported where used
+if TYPE_CHECKING:
+    from crewai import Task
 
 logger = setup_logger()
+trace_logger = get_trace_logger()
+
+# Patterns for pulling structured data out of agent output. They avoid
+# lookarounds and backreferences so they compile under both RE2 and re.
+_ENTRY_RE = regex.compile(
+    r"(?m)^[ \t]*\d+[.)][ \t]+[*_]*(?P<name>[^*_\n|:]+?)[*_]*"
+    r"(?:[ \t]+[-|][ \t]+(?P<location>[^\n]+?))?[ \t]*$"
+)
+_FIELD_RE = regex.compile(
+    r"(?m)^[ \t]*[-*]?[ \t]*[*_]*(?P<key>[A-Za-z][A-Za-z &/()]{0,40}?)[*_]*[ \t]*:[ \t]*(?P<value>[^\n]+)$"
+)
+_SCORE_RE = regex.compile(r"(?P<score>\d+(?:\.\d+)?)[ \t]*/[ \t]*10\b")
+_URL_RE = regex.compile(r"https?://[^\s)>\]]+")
+_RISK_LEVEL_RE = regex.compile(r"\b(?P<level>LOW|MEDIUM|HIGH|CRITICAL)\b")
+_OVERALL_RISK_RE = regex.compile(r"(?i)overall[^\n]*?\b(?P<level>low|medium|high|critical)\b")
+_SECTION_RE = regex.compile(r"(?m)^[ \t#*]*(?:\d+\.[ \t]*)?(?P<title>[A-Z][A-Z &]{3,})[ \t*]*$")
+
+def _split_entries(raw_result: str):
+    """Yield (heading match, body text) for each numbered entry in an agent output"""
+    headings = list(_ENTRY_RE.finditer(raw_result))
+    for i, heading in enumerate(headings):
+        end = headings[i + 1].start() if i + 1 < len(headings) else len(raw_result)
+        yield heading, raw_result[heading.end():end]
+
+def _to_prompt_json(data: Any) -> str:
+    """Serialize structured data as compact JSON for embedding in a task prompt"""
+    return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+def _field_key(key: str) -> str:
+    """Normalize a 'Key Name:' label into a snake_case dict key"""
+    return "_".join(key.lower().replace("/", " ").replace("&", " ").split())
+
+def _model_name(llm) -> str:
+    """Return the model identifier of a LangChain chat model"""
+    return str(getattr(llm, 'model_name', None) or getattr(llm, 'model', ''))
+
+def _crew_request(manager: "SourcingCrewManager", role: str, task: "Task"):
+    """Collect the model name and every prompt field that shapes a crew's output"""
+    agent = task.agent
+    return _model_name(manager.llm), {
+        'role': agent.role,
+        'goal': agent.goal,
+        'backstory': agent.backstory,
+        'tools': [tool.name for tool in agent.tools or [] if tool],
+        'description': task.description,
+        'expected_output': task.expected_output,
+        'temperature': getattr(manager.llm, 'temperature', None),
+    }
 
 class SourcingCrewManager:
     """
@@ -31,22 +91,53 @@ class SourcingCrewManager:
     to perform comprehensive supplier sourcing and evaluation.
     """
 
-    def __init__(self):
-        self.config = Config()
+    def __init__(self, use_cache: bool = True, cache_dir: str = "data"):
+        self.config = get_config()
+        self.use_cache = use_cache and self.config.cache_enabled
         self.llm = self._initialize_llm()
         self.tools = self._initialize_tools()
         self.agents = self._create_agents()
+        self.crews = self._create_crews()
+        self._crew_locks = {role: threading.Lock() for role in self.crews}
+        # Blocking crew and cache calls run here (None: the loop's default executor)
+        self.executor: Optional[Executor] = None
+        self.cache = self._initialize_cache()
+        self.llm_cache = None
+        self.semantic_cache = None
+        if self.use_cache:
+            self.llm_cache = LLMCache(str(Path(cache_dir) / "llm_cache.db"))
+            self.semantic_cache = SemanticCache(str(Path(cache_dir) / "semantic_cache.db"))
+
+    def fork(self, executor: Optional[Executor] = None) -> "SourcingCrewManager":
+        """Return a manager sharing this one's LLM, tools and caches but with its own agents, crews and executor"""
+        # Separate crews mean separate locks: an abandoned run on the fork
+        # (whose worker thread cannot be cancelled) never blocks this manager,
+        # and a separate executor keeps it out of asyncio.run's shutdown wait
+        forked = copy.copy(self)
+        forked.agents = forked._create_agents()
+        forked.crews = forked._create_crews()
+        forked._crew_locks = {role: threading.Lock() for role in forked.crews}
+        forked.executor = executor
+        return forked
+
+    async def _in_executor(self, func, *args):
+        """Run a blocking call on this manager's executor"""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, functools.partial(func, *args))
 
     def _initialize_llm(self):
         """Initialize the language model"""
         try:
             if self.config.openai_api_key:
+                from langchain_openai import ChatOpenAI
+
                 return ChatOpenAI(
                     model_name="gpt-4",
                     temperature=0.1,
                     api_key=self.config.openai_api_key
                 )
             elif self.config.google_api_key:
+                from langchain_google_genai import ChatGoogleGenerativeAI
+
                 return ChatGoogleGenerativeAI(
                     model="gemini-pro",
                     temperature=0.1,
@@ -63,6 +154,12 @@ class SourcingCrewManager:
         tools = {}
 
         try:
+            from crewai_tools import SerperDevTool
+            from .tools.web_search import WebSearchTool
+            from .tools.scrape_website import WebsiteScraperTool
+            from .tools.supplier_database import SupplierDatabaseTool
+            from .tools.compliance_checker import ComplianceCheckerTool
+
             # Web search tools
             if self.config.serper_api_key:
                 tools['serper'] = SerperDevTool(api_key=self.config.serper_api_key)
@@ -71,7 +168,7 @@ class SourcingCrewManager:
             tools['web_search'] = WebSearchTool()
             tools['supplier_db'] = SupplierDatabaseTool()
             tools['compliance'] = ComplianceCheckerTool()
-            tools['scraper'] = ScrapeWebsiteTool()
+            tools['scraper'] = WebsiteScraperTool()
 
             logger.info(f"Initialized {len(tools)} tools")
             return tools
@@ -80,11 +177,65 @@ class SourcingCrewManager:
             logger.error(f"Failed to initialize tools: {e}")
             return {}
 
+    def _initialize_cache(self):
+        """Initialize the Redis cache used to memoize crew results"""
+        if not self.use_cache:
+            return None
+
+        try:
+            cache = redis.Redis.from_url(self.config.redis_url)
+            # from_url connects lazily: check once here rather than failing (and
+            # warning) on every lookup and store when no server is running
+            cache.ping()
+            return cache
+        except Exception as e:
+            logger.warning(f"Redis cache unavailable, running uncached: {e}")
+            return None
+
+    def _cache_key(self, role: str, task: "Task") -> str:
+        """Build a cache key from the model and every prompt field that shapes the output"""
+        # Same fields as the LLMCache key, so a changed agent or task template misses both tiers
+        return "crew:" + LLMCache.make_key(*_crew_request(self, role, task))
+
+    @cached_call(_crew_request)
+    def _run_crew(self, role: str, task: "Task") -> str:
+        """Run a task on an agent's reusable crew (called from a worker thread)"""
+        crew = self.crews[role]
+        with self._crew_locks[role]:
+            crew.tasks = [task]
+            return str(crew.kickoff())
+
+    async def _cached_kickoff(self, role: str, task: "Task") -> str:
+        """Run an agent's task, reusing a cached result for an identical task prompt"""
+        key = self._cache_key(role, task)
+
+        if self.cache is not None:
+            try:
+                cached = await self._in_executor(self.cache.get, key)
+                if cached is not None:
+                    logger.info(f"Cache hit for {task.agent.role}")
+                    return cached.decode("utf-8")
+            except redis.RedisError as e:
+                logger.warning(f"Cache lookup failed: {e}")
+
+        # Redis misses fall through to the local persistent LLM cache in _run_crew
+        result = await self._in_executor(self._run_crew, role, task)
+
+        if self.cache is not None:
+            try:
+                await self._in_executor(self.cache.setex, key, self.config.cache_ttl, result)
+            except redis.RedisError as e:
+                logger.warning(f"Cache store failed: {e}")
+
+        return result
+
     def _create_agents(self):
         """Create and configure all AI agents"""
         agents = {}
 
         try:
+            from crewai import Agent
+
             # Sourcing Researcher Agent
             agents['researcher'] = Agent(
                 role='Senior Sourcing Researcher',
@@ -158,8 +309,29 @@ class SourcingCrewManager:
             logger.error(f"Failed to create agents: {e}")
             return {}
 
+    def _create_crews(self):
+        """Create one reusable single-agent crew per agent; tasks are swapped in per run"""
+        try:
+            from crewai import Crew, Process
+
+            return {
+                role: Crew(
+                    agents=[agent],
+                    tasks=[],
+                    verbose=True,
+                    process=Process.sequential,
+                    step_callback=lambda step, role=role: trace_logger.debug(f"[{role}] {step}")
+                )
+                for role, agent in self.agents.items()
+            }
+
+        except Exception as e:
+            logger.error(f"Failed to create crews: {e}")
+            return {}
+
     async def research_suppliers(self, product_category: str, location_preference: str = "Global") -> List[Dict]:
         """Research and discover potential suppliers"""
+        from crewai import Task
 
         research_task = Task(
             description=f"""
@@ -183,18 +355,19 @@ class SourcingCrewManager:
             expected_output="Structured list of potential suppliers with detailed information"
         )
 
-        # Create crew for research
-        research_crew = Crew(
-            agents=[self.agents['researcher']],
-            tasks=[research_task],
-            verbose=True,
-            process=Process.sequential
-        )
-
         try:
-            result = research_crew.kickoff()
+            # Similarly worded categories reuse research for the same location only;
+            # misses use the exact caches
+            call_llm = lambda: self._cached_kickoff('researcher', research_task)
+            if self.semantic_cache is not None:
+                result = await self.semantic_cache.ask(
+                    f"{product_category} suppliers", call_llm,
+                    scope=" ".join(location_preference.lower().split())
+                )
+            else:
+                result = await call_llm()
             # Parse result into structured format
-            suppliers = self._parse_supplier_list(str(result))
+            suppliers = self._parse_supplier_list(result)
             logger.info(f"Found {len(suppliers)} potential suppliers")
             return suppliers
 
@@ -204,13 +377,14 @@ class SourcingCrewManager:
 
     async def analyze_suppliers(self, suppliers: List[Dict], quality_standards: List[str]) -> Dict:
         """Analyze supplier capabilities and performance"""
+        from crewai import Task
 
         analysis_task = Task(
             description=f"""
             Analyze the following suppliers for capabilities and performance:
 
-            Suppliers to analyze: {suppliers}
-            Quality standards to consider: {quality_standards}
+            Suppliers to analyze: {_to_prompt_json(suppliers)}
+            Quality standards to consider: {_to_prompt_json(quality_standards)}
 
             For each supplier, evaluate:
             1. Product quality and certifications
@@ -229,16 +403,9 @@ class SourcingCrewManager:
             expected_output="Comprehensive supplier analysis with scores and recommendations"
         )
 
-        analysis_crew = Crew(
-            agents=[self.agents['analyst']],
-            tasks=[analysis_task],
-            verbose=True,
-            process=Process.sequential
-        )
-
         try:
-            result = analysis_crew.kickoff()
-            analysis = self._parse_analysis_result(str(result))
+            result = await self._cached_kickoff('analyst', analysis_task)
+            analysis = self._parse_analysis_result(result)
             logger.info("Supplier analysis completed")
             return analysis
 
@@ -248,10 +415,11 @@ class SourcingCrewManager:
 
     async def assess_risks(self, suppliers: List[Dict]) -> Dict:
         """Assess risks for each supplier"""
+        from crewai import Task
 
         risk_task = Task(
             description=f"""
-            Conduct comprehensive risk assessment for these suppliers: {suppliers}
+            Conduct comprehensive risk assessment for these suppliers: {_to_prompt_json(suppliers)}
 
             Evaluate the following risk categories:
             1. Financial Risk - stability, creditworthiness, bankruptcy risk
@@ -272,16 +440,9 @@ class SourcingCrewManager:
             expected_output="Detailed risk assessment matrix with mitigation recommendations"
         )
 
-        risk_crew = Crew(
-            agents=[self.agents['risk_assessor']],
-            tasks=[risk_task],
-            verbose=True,
-            process=Process.sequential
-        )
-
         try:
-            result = risk_crew.kickoff()
-            risk_assessment = self._parse_risk_assessment(str(result))
+            result = await self._cached_kickoff('risk_assessor', risk_task)
+            risk_assessment = self._parse_risk_assessment(result)
             logger.info("Risk assessment completed")
             return risk_assessment
 
@@ -293,6 +454,7 @@ class SourcingCrewManager:
                             risk_assessment: Dict, product_category: str,
                             budget_range: str, sustainability_requirements: bool) -> Dict:
         """Generate comprehensive sourcing report"""
+        from crewai import Task
 
         report_task = Task(
             description=f"""
@@ -302,9 +464,9 @@ class SourcingCrewManager:
             Budget Range: {budget_range}
             Sustainability Required: {sustainability_requirements}
 
-            Suppliers Found: {suppliers}
-            Analysis Results: {analysis}
-            Risk Assessment: {risk_assessment}
+            Suppliers Found: {_to_prompt_json(suppliers)}
+            Analysis Results: {_to_prompt_json(analysis)}
+            Risk Assessment: {_to_prompt_json(risk_assessment)}
 
             Generate a professional report including:
 
@@ -342,16 +504,9 @@ class SourcingCrewManager:
             expected_output="Professional sourcing report in structured format"
         )
 
-        report_crew = Crew(
-            agents=[self.agents['reporter']],
-            tasks=[report_task],
-            verbose=True,
-            process=Process.sequential
-        )
-
         try:
-            result = report_crew.kickoff()
-            report = self._parse_final_report(str(result))
+            result = await self._cached_kickoff('reporter', report_task)
+            report = self._parse_final_report(result)
             logger.info("Final report generated")
             return report
 
@@ -361,10 +516,23 @@ class SourcingCrewManager:
 
     def _parse_supplier_list(self, raw_result: str) -> List[Dict]:
         """Parse raw supplier research results into structured format"""
-        # This would include parsing logic to extract structured data
-        # For now, return mock data structure
         suppliers = []
-        # Add parsing logic here based on the actual output format
+
+        for heading, body in _split_entries(raw_result):
+            supplier = {'name': heading.group('name').strip()}
+            if heading.group('location'):
+                supplier['location'] = heading.group('location').strip()
+
+            for field in _FIELD_RE.finditer(body):
+                supplier.setdefault(_field_key(field.group('key')), field.group('value').strip())
+
+            if 'website' not in supplier:
+                url = _URL_RE.search(body)
+                if url:
+                    supplier['website'] = url.group(0)
+
+            suppliers.append(supplier)
+
         return suppliers
 
     def _parse_analysis_result(self, raw_result: str) -> Dict:
@@ -375,7 +543,33 @@ class SourcingCrewManager:
             'scoring_criteria': [],
             'average_scores': {}
         }
-        # Add parsing logic here
+
+        # Scores are gathered column-wise (criterion -> values) so averages are
+        # one reduction per criterion. If this moves to a DataFrame, keep that
+        # shape: iterate with itertuples()/to_dict('records') and assign whole
+        # columns rather than using apply(axis=1) or per-cell iloc writes.
+        totals: Dict[str, List[float]] = {}
+        for heading, body in _split_entries(raw_result):
+            scores = {}
+            for field in _FIELD_RE.finditer(body):
+                score = _SCORE_RE.search(field.group('value'))
+                if score:
+                    criterion = _field_key(field.group('key'))
+                    scores[criterion] = float(score.group('score'))
+                    totals.setdefault(criterion, []).append(scores[criterion])
+
+            if scores:
+                analysis['analyzed_suppliers'].append({
+                    'name': heading.group('name').strip(),
+                    'scores': scores
+                })
+
+        analysis['total_suppliers'] = len(analysis['analyzed_suppliers'])
+        analysis['scoring_criteria'] = list(totals)
+        analysis['average_scores'] = {
+            criterion: round(sum(values) / len(values), 2)
+            for criterion, values in totals.items()
+        }
         return analysis
 
     def _parse_risk_assessment(self, raw_result: str) -> Dict:
@@ -386,7 +580,28 @@ class SourcingCrewManager:
             'supplier_risks': {},
             'mitigation_strategies': []
         }
-        # Add parsing logic here
+
+        overall = _OVERALL_RISK_RE.search(raw_result)
+        if overall:
+            risk_data['overall_risk_level'] = overall.group('level').upper()
+
+        for heading, body in _split_entries(raw_result):
+            risks = {}
+            for field in _FIELD_RE.finditer(body):
+                key = _field_key(field.group('key'))
+                if 'mitigation' in key:
+                    risk_data['mitigation_strategies'].append(field.group('value').strip())
+                    continue
+
+                level = _RISK_LEVEL_RE.search(field.group('value'))
+                if level:
+                    risks[key] = level.group('level')
+                    if key not in risk_data['risk_categories']:
+                        risk_data['risk_categories'].append(key)
+
+            if risks:
+                risk_data['supplier_risks'][heading.group('name').strip()] = risks
+
         return risk_data
 
     def _parse_final_report(self, raw_result: str) -> Dict:
@@ -401,5 +616,16 @@ class SourcingCrewManager:
             'generated_at': str(asyncio.get_event_loop().time()),
             'full_report': raw_result
         }
-        # Add parsing logic here
+
+        sections = list(_SECTION_RE.finditer(raw_result))
+        for i, section in enumerate(sections):
+            if section.group('title').strip() == 'EXECUTIVE SUMMARY':
+                end = sections[i + 1].start() if i + 1 < len(sections) else len(raw_result)
+                report['executive_summary'] = raw_result[section.end():end].strip()
+                break
+
+        overall = _OVERALL_RISK_RE.search(raw_result)
+        if overall:
+            report['overall_risk_level'] = overall.group('level').upper()
+
         return report
@@ -0,0 +1,139 @@
+"""
+LLM Response Cache
+==================
+
+Persists LLM responses in SQLite so repeated prompts skip the API call.
+"""
+
+import functools
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+import orjson
+
+DEFAULT_TTL = 7 * 86400  # 1 week
+
+# Hits refresh an entry's access time at most this often, so hot reads stay reads
+TOUCH_INTERVAL = 60
+
+# Request fields that never change the model output and must not split the cache
+_IGNORED_FIELDS = frozenset({"stream", "user", "api_key"})
+
+class LLMCache:
+    """
+    SQLite-backed exact-match cache of LLM responses with LRU eviction
+    """
+
+    def __init__(self, db_path: str = "data/llm_cache.db", max_entries: int = 10000):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+
+            -- ts is when the response was stored (for the TTL), atime when it
+            -- was last read (for LRU eviction)
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                k TEXT PRIMARY KEY,
+                v BLOB NOT NULL,
+                ts INTEGER NOT NULL,
+                atime INTEGER NOT NULL DEFAULT 0
+            );
+        """)
+
+        # Caches created before atime existed get the column; their rows evict first
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(llm_cache)")}
+        if "atime" not in columns:
+            self._conn.execute("ALTER TABLE llm_cache ADD COLUMN atime INTEGER NOT NULL DEFAULT 0")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_atime ON llm_cache (atime)")
+
+    @staticmethod
+    def make_key(model: str, request: Dict[str, Any]) -> str:
+        """Hash the model name and the output-affecting request fields"""
+        fields = {k: v for k, v in request.items() if k not in _IGNORED_FIELDS}
+        payload = orjson.dumps(fields, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+        return hashlib.sha256(model.encode("utf-8") + b"\x00" + payload).hexdigest()
+
+    def get(self, key: str, ttl: Optional[int] = None) -> Optional[str]:
+        """Return a cached response, or None if missing or older than ttl seconds"""
+        now = int(time.time())
+        with self._lock:
+            row = self._conn.execute("SELECT v, ts, atime FROM llm_cache WHERE k = ?", (key,)).fetchone()
+            if row is None:
+                return None
+
+            # Age counts from when the response was stored, however often it is read
+            if ttl is not None and now - row[1] > ttl:
+                self._conn.execute("DELETE FROM llm_cache WHERE k = ?", (key,))
+                return None
+
+            # Touch the entry so eviction drops least recently used rows first
+            if now - row[2] >= TOUCH_INTERVAL:
+                self._conn.execute("UPDATE llm_cache SET atime = ? WHERE k = ?", (now, key))
+            return row[0].decode("utf-8")
+
+    def set(self, key: str, value: str):
+        """Store a response, evicting the least recently used entries over max_entries"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = int(time.time())
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache (k, v, ts, atime) VALUES (?, ?, ?, ?)",
+                    (key, value.encode("utf-8"), now, now)
+                )
+                count = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+                if count > self.max_entries:
+                    self._conn.execute(
+                        "DELETE FROM llm_cache WHERE k IN (SELECT k FROM llm_cache ORDER BY atime LIMIT ?)",
+                        (count - self.max_entries,)
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def close(self):
+        """Close the cache database"""
+        with self._lock:
+            self._conn.close()
+
+def cached_call(
+    request: Callable[..., Tuple[str, Dict[str, Any]]],
+    ttl: int = DEFAULT_TTL,
+    cache_attr: str = "llm_cache"
+):
+    """
+    Cache a method's string result in the LLMCache held on its instance
+
+    Args:
+        request: Builds (model name, request fields) from the method's arguments
+        ttl: Maximum age of a reusable response in seconds
+        cache_attr: Instance attribute holding the LLMCache (None disables caching)
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            cache = getattr(self, cache_attr, None)
+            if cache is None:
+                return func(self, *args, **kwargs)
+
+            key = LLMCache.make_key(*request(self, *args, **kwargs))
+            cached = cache.get(key, ttl)
+            if cached is not None:
+                return cached
+
+            result = func(self, *args, **kwargs)
+            cache.set(key, result)
+            return result
+
+        return wrapper
+
+    return decorator
@@ -11,6 +11,14 @@ from pathlib import Path
 from loguru import logger
 from typing import Optional
 
+def _is_trace(record) -> bool:
+    """Match records emitted through the trace logger"""
+    return record["extra"].get("trace", False)
+
+def _is_not_trace(record) -> bool:
+    """Match regular application records"""
+    return not record["extra"].get("trace", False)
+
 def setup_logger(
     level: str = "INFO",
     log_file: Optional[str] = None,
@@ -33,12 +41,41 @@ def setup_logger(
     # Remove default handler
     logger.remove()
 
+    # DEBUG/TRACE get the full format with call-site details; INFO and above
+    # take a plain fast path since verbose agent runs log on every step
+    verbose = logger.level(level.upper()).no < logger.level("INFO").no
+
     # Add console handler with custom format
+    if verbose:
+        logger.add(
+            sys.stdout,
+            level=level,
+            format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
+            filter=_is_not_trace,
+            colorize=sys.stdout.isatty()
+        )
+    else:
+        logger.add(
+            sys.stdout,
+            level=level,
+            format="{time:HH:mm:ss} | {level} | {message}",
+            filter=_is_not_trace,
+            colorize=False,
+            backtrace=False,
+            diagnose=False
+        )
+
+    # High-volume agent trace lines get a bare sink with no call-site fields.
+    # Traces are logged at DEBUG, so the sink accepts DEBUG regardless of the
+    # console level; the filter keeps regular DEBUG records out of it.
     logger.add(
         sys.stdout,
-        level=level,
-        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-        colorize=True
+        level="DEBUG",
+        format="{time:HH:mm:ss}|{message}",
+        filter=_is_trace,
+        colorize=False,
+        backtrace=False,
+        diagnose=False
     )
 
     # Add file handler if specified
@@ -52,7 +89,9 @@ def setup_logger(
             format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
             rotation=rotation,
             retention=retention,
-            compression="zip"
+            compression="zip",
+            backtrace=verbose,
+            diagnose=verbose
         )
 
     return logger
@@ -60,3 +99,7 @@ def setup_logger(
 def get_logger(name: str) -> logger:
     """Get a logger instance for a specific module"""
     return logger.bind(name=name)
+
+def get_trace_logger() -> logger:
+    """Get a logger for high-volume agent trace output (plain console format)"""
+    return logger.bind(trace=True)
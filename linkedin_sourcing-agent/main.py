@@ -17,28 +17,38 @@ License: MIT
 """
 
 import asyncio
+import sys
 import typer
-from rich.console import Console
-from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from functools import lru_cache
+from pathlib import Path
 from typing import Optional, List
-import json
-from datetime import datetime
+import time
 import os
-from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
 
-# Load environment variables
-load_dotenv()
-
-# Import our custom modules
-from src.crew_manager import SourcingCrewManager
-from src.utils.config import Config
+# rich, crewai and the LLM SDKs are imported inside the commands that need
+# them so `setup`, `dashboard` and `--help` start without loading them
 from src.utils.logger import setup_logger
 
-# Initialize console and logger
-console = Console()
 logger = setup_logger()
 
+@lru_cache(maxsize=1)
+def _get_console():
+    """Return the shared rich console, creating it on first use"""
+    from rich.console import Console
+
+    # Output is plain text plus explicit styles, so skip markup parsing and
+    # repr highlighting (which would also mangle brackets in error messages)
+    return Console(highlight=False, markup=False)
+
+REPORTS_DIR = Path("data/reports")
+
+@lru_cache(maxsize=1)
+def _reports_dir() -> Path:
+    """Return the reports directory, creating it only on the first call"""
+    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    return REPORTS_DIR
+
 # Create Typer app
 app = typer.Typer(
     name="ai-sourcing-agent",
@@ -46,13 +56,37 @@ app = typer.Typer(
     add_completion=False,
 )
 
+def _discard(future: asyncio.Future):
+    """Cancel a background future and mark its outcome as retrieved"""
+    future.cancel()
+    future.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+def _top_suppliers(suppliers: List[dict], k: int = 5) -> List[dict]:
+    """Return the k highest-scoring suppliers, best first, keeping report order among equal scores"""
+    import numpy as np
+
+    # Selecting around the k-th largest score is O(n); only those k are then sorted.
+    # Partitioning alone is not stable, so ties at the cut-off go to the earliest rows.
+    scores = np.fromiter((s.get('score') or 0 for s in suppliers), dtype=np.float64, count=len(suppliers))
+    if len(suppliers) > k:
+        cutoff = np.partition(scores, len(scores) - k)[len(scores) - k]
+        above = np.flatnonzero(scores > cutoff)
+        top = np.concatenate((above, np.flatnonzero(scores == cutoff)[:k - len(above)]))
+    else:
+        top = np.arange(len(suppliers))
+    return [suppliers[i] for i in top[np.lexsort((top, -scores[top]))]]
+
 class SourcingAgent:
     """Main AI Sourcing Agent class"""
 
-    def __init__(self):
-        self.config = Config()
-        self.crew_manager = SourcingCrewManager()
-        self.console = Console()
+    def __init__(self, use_cache: bool = True):
+        from src.crew_manager import SourcingCrewManager
+        from src.utils.config import get_config
+        from src.utils.plan_cache import PlanCache
+
+        self.config = get_config()
+        self.crew_manager = SourcingCrewManager(use_cache=use_cache)
+        self.plan_cache = PlanCache() if self.crew_manager.use_cache else None
 
     def display_banner(self):
         """Display application banner"""
@@ -68,7 +102,7 @@ class SourcingAgent:
 │                                                                 │
 ╰─────────────────────────────────────────────────────────────────╯
         """
-        self.console.print(banner, style="bold blue")
+        _get_console().print(banner, style="bold blue")
 
     async def run_sourcing_analysis(self, 
                                   product_category: str,
@@ -77,12 +111,30 @@ class SourcingAgent:
                                   sustainability_requirements: bool = True,
                                   quality_standards: List[str] = None):
         """Run comprehensive sourcing analysis"""
+        from rich.progress import Progress, SpinnerColumn, TextColumn
 
         self.display_banner()
 
+        # An identical request reuses the whole research -> report run
+        previous_suppliers = None
+        if self.plan_cache is not None:
+            plan_key = self.plan_cache.make_key({
+                'product_category': product_category,
+                'budget_range': budget_range,
+                'location_preference': location_preference,
+                'sustainability_requirements': sustainability_requirements,
+                'quality_standards': sorted(quality_standards or []),
+            })
+            cached = self.plan_cache.get(plan_key)
+            if cached is not None:
+                logger.info("Reusing cached sourcing run")
+                return cached['report']
+            previous_suppliers = self.plan_cache.get_suppliers(plan_key)
+
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
+            console=_get_console(),
             transient=True,
         ) as progress:
 
@@ -90,21 +142,42 @@ class SourcingAgent:
             task1 = progress.add_task("🚀 Initializing AI Sourcing Crew...", total=None)
             await asyncio.sleep(1)
 
-            # Step 2: Research suppliers
-            progress.update(task1, description="🔍 Researching suppliers...")
-            suppliers = await self.crew_manager.research_suppliers(
-                product_category, location_preference
-            )
+            # Speculatively analyze the previous run's suppliers while research runs.
+            # Cancelling cannot stop a crew already running on a worker thread, so
+            # speculation uses forked crews on their own threads, which neither the
+            # real analysis nor asyncio.run's executor shutdown waits for.
+            speculative = None
+            speculation_pool = None
+            if previous_suppliers:
+                speculation_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="speculation")
+                speculator = self.crew_manager.fork(executor=speculation_pool)
+                speculative = asyncio.gather(
+                    speculator.analyze_suppliers(previous_suppliers, quality_standards or []),
+                    speculator.assess_risks(previous_suppliers)
+                )
 
-            # Step 3: Analyze suppliers
-            progress.update(task1, description="📊 Analyzing supplier capabilities...")
-            analysis = await self.crew_manager.analyze_suppliers(
-                suppliers, quality_standards or []
-            )
+            try:
+                # Step 2: Research suppliers
+                progress.update(task1, description="🔍 Researching suppliers...")
+                suppliers = await self.crew_manager.research_suppliers(
+                    product_category, location_preference
+                )
 
-            # Step 4: Assess risks
-            progress.update(task1, description="⚠️  Assessing supplier risks...")
-            risk_assessment = await self.crew_manager.assess_risks(suppliers)
+                # Steps 3 & 4: Analyze suppliers and assess risks (both only need the supplier list)
+                progress.update(task1, description="📊 Analyzing capabilities & ⚠️  assessing risks...")
+                if speculative is not None and suppliers == previous_suppliers:
+                    logger.info("Research matched the previous supplier list, using speculative analysis")
+                    analysis, risk_assessment = await speculative
+                else:
+                    analysis, risk_assessment = await asyncio.gather(
+                        self.crew_manager.analyze_suppliers(suppliers, quality_standards or []),
+                        self.crew_manager.assess_risks(suppliers)
+                    )
+            finally:
+                if speculative is not None:
+                    _discard(speculative)
+                if speculation_pool is not None:
+                    speculation_pool.shutdown(wait=False, cancel_futures=True)
 
             # Step 5: Generate report
             progress.update(task1, description="📄 Generating comprehensive report...")
@@ -115,13 +188,25 @@ class SourcingAgent:
 
             progress.update(task1, description="✅ Analysis complete!")
 
+        # Failed research leaves nothing worth replaying
+        if self.plan_cache is not None and suppliers:
+            self.plan_cache.set(plan_key, {
+                'suppliers': suppliers,
+                'analysis': analysis,
+                'risk_assessment': risk_assessment,
+                'report': report,
+            })
+
         return report
 
     def display_results(self, report: dict):
         """Display sourcing results in a formatted table"""
+        from rich.table import Table
+        from src.utils.stream_json import write_report
 
-        self.console.print("\n🎯 SOURCING ANALYSIS RESULTS", style="bold green")
-        self.console.print("="*50, style="green")
+        console = _get_console()
+        console.print("\n🎯 SOURCING ANALYSIS RESULTS", style="bold green")
+        console.print("="*50, style="green")
 
         # Summary table
         summary_table = Table(title="📊 Executive Summary")
@@ -133,7 +218,7 @@ class SourcingAgent:
         summary_table.add_row("Risk Level", report.get('overall_risk_level', 'Unknown'))
         summary_table.add_row("Estimated Savings", report.get('estimated_savings', 'N/A'))
 
-        self.console.print(summary_table)
+        console.print(summary_table)
 
         # Top suppliers table
         if 'top_suppliers' in report:
@@ -144,7 +229,7 @@ class SourcingAgent:
             suppliers_table.add_column("Score", style="magenta")
             suppliers_table.add_column("Risk Level", style="red")
 
-            for i, supplier in enumerate(report['top_suppliers'][:5], 1):
+            for i, supplier in enumerate(_top_suppliers(report['top_suppliers']), 1):
                 suppliers_table.add_row(
                     str(i),
                     supplier.get('name', 'Unknown'),
@@ -153,17 +238,16 @@ class SourcingAgent:
                     supplier.get('risk_level', 'Unknown')
                 )
 
-            self.console.print(suppliers_table)
+            console.print(suppliers_table)
 
         # Save report
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"sourcing_report_{timestamp}.json"
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        report_path = _reports_dir() / f"sourcing_report_{timestamp}.json"
 
-        os.makedirs("data/reports", exist_ok=True)
-        with open(f"data/reports/{filename}", "w") as f:
-            json.dump(report, f, indent=2, default=str)
+        summary_fields = {k: v for k, v in report.items() if k != 'top_suppliers'}
+        write_report(report_path, summary_fields, report.get('top_suppliers', []))
 
-        self.console.print(f"\n💾 Full report saved to: data/reports/{filename}", style="green")
+        console.print(f"\n💾 Full report saved to: {report_path.as_posix()}", style="green")
 
 @app.command()
 def analyze(
@@ -171,7 +255,8 @@ def analyze(
     budget: str = typer.Option("$10,000-$50,000", "--budget", "-b", help="Budget range"),
     location: str = typer.Option("Global", "--location", "-l", help="Location preference"),
     sustainability: bool = typer.Option(True, "--sustainability", "-s", help="Include sustainability requirements"),
-    quality: Optional[str] = typer.Option(None, "--quality", "-q", help="Quality standards (comma-separated)")
+    quality: Optional[str] = typer.Option(None, "--quality", "-q", help="Quality standards (comma-separated)"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Bypass every result cache and query the LLM afresh")
 ):
     """
     Run AI-powered sourcing analysis for a specific product category
@@ -185,12 +270,23 @@ def analyze(
     if quality:
         quality_standards = [q.strip() for q in quality.split(",")]
 
+    # Run the async pipeline on libuv when available (uvloop is POSIX-only).
+    # uvloop.run only affects this call, unlike the deprecated uvloop.install()
+    # which swapped the process-wide event loop policy.
+    run = asyncio.run
+    if sys.platform != "win32":
+        try:
+            import uvloop
+            run = uvloop.run
+        except ImportError:
+            pass
+
     # Create and run sourcing agent
-    agent = SourcingAgent()
+    agent = SourcingAgent(use_cache=not no_cache)
 
     try:
         # Run async analysis
-        report = asyncio.run(agent.run_sourcing_analysis(
+        report = run(agent.run_sourcing_analysis(
             product_category=product,
             budget_range=budget,
             location_preference=location,
@@ -202,13 +298,14 @@ def analyze(
         agent.display_results(report)
 
     except Exception as e:
-        console.print(f"❌ Error: {str(e)}", style="bold red")
+        _get_console().print(f"❌ Error: {str(e)}", style="bold red")
         logger.error(f"Sourcing analysis failed: {e}")
         raise typer.Exit(1)
 
 @app.command()
 def dashboard():
     """Launch the interactive web dashboard"""
+    console = _get_console()
     console.print("🚀 Launching AI Sourcing Agent Dashboard...", style="bold blue")
 
     try:
@@ -221,6 +318,7 @@ def dashboard():
 @app.command()
 def setup():
     """Setup the AI Sourcing Agent environment"""
+    console = _get_console()
     console.print("🔧 Setting up AI Sourcing Agent...", style="bold blue")
 
     # Create necessary directories
@@ -232,8 +330,8 @@ def setup():
     ]
 
     for directory in directories:
-        os.makedirs(directory, exist_ok=True)
-        console.print(f"✅ Created directory: {directory}")
+        Path(directory).mkdir(parents=True, exist_ok=True)
+    console.print("✅ Created directories:\n  " + "\n  ".join(directories))
 
     # Create .env file if it doesn't exist
     if not os.path.exists(".env"):
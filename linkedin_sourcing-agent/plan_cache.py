@@ -0,0 +1,82 @@
+"""
+Plan Cache
+==========
+
+Stores the artifacts of a complete sourcing run so an identical request can
+skip the research -> analysis -> risk -> report pipeline.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import orjson
+
+DEFAULT_TTL = 86400  # 1 day
+
+class PlanCache:
+    """
+    SQLite-backed cache of whole sourcing-run artifacts keyed on the run inputs
+    """
+
+    def __init__(self, db_path: str = "data/plan_cache.db", ttl: int = DEFAULT_TTL):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+
+            CREATE TABLE IF NOT EXISTS plan_cache (
+                k TEXT PRIMARY KEY,
+                artifacts BLOB NOT NULL,
+                ts INTEGER NOT NULL
+            );
+        """)
+
+    @staticmethod
+    def make_key(inputs: Dict[str, Any]) -> str:
+        """Hash the run inputs independently of their order"""
+        payload = orjson.dumps(inputs, default=str, option=orjson.OPT_SORT_KEYS)
+        return hashlib.sha256(payload).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the stored artifacts for a run, or None if missing or expired"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT artifacts, ts FROM plan_cache WHERE k = ?", (key,)
+            ).fetchone()
+
+        if row is None or time.time() - row[1] > self.ttl:
+            return None
+        return orjson.loads(row[0])
+
+    def get_suppliers(self, key: str) -> Optional[List[Dict]]:
+        """Return the supplier list of a previous run, even if it has expired (until the next set prunes it)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT artifacts FROM plan_cache WHERE k = ?", (key,)
+            ).fetchone()
+
+        return orjson.loads(row[0]).get('suppliers') if row else None
+
+    def set(self, key: str, artifacts: Dict[str, Any]):
+        """Store the artifacts of a completed run, pruning expired runs"""
+        blob = orjson.dumps(artifacts, default=str, option=orjson.OPT_NON_STR_KEYS)
+        now = int(time.time())
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO plan_cache (k, artifacts, ts) VALUES (?, ?, ?)",
+                (key, blob, now)
+            )
+            self._conn.execute("DELETE FROM plan_cache WHERE ts < ?", (now - self.ttl,))
+
+    def close(self):
+        """Close the cache database"""
+        with self._lock:
+            self._conn.close()
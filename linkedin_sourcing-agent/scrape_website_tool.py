@@ -0,0 +1,47 @@
+"""
+Website Scraper Tool
+====================
+
+Reads web page content for the AI agents over a shared, pooled HTTP client.
+"""
+
+import atexit
+import httpx
+from bs4 import BeautifulSoup
+from crewai_tools import BaseTool
+
+# One keep-alive HTTP/2 client shared by every scrape so repeated requests
+# to the same hosts reuse connections instead of redoing TCP/TLS handshakes
+_HTTP = httpx.Client(
+    http2=True,
+    timeout=10.0,
+    follow_redirects=True,
+    limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+    headers={"User-Agent": "Mozilla/5.0 (compatible; AISourcingAgent/1.0)"}
+)
+atexit.register(_HTTP.close)
+
+class WebsiteScraperTool(BaseTool):
+    """
+    Tool for reading the text content of supplier and company websites
+    """
+
+    name: str = "scrape_website"
+    description: str = "Read the text content of a website given its URL"
+
+    def _run(self, website_url: str) -> str:
+        """
+        Fetch a page and return its visible text
+        """
+        try:
+            response = _HTTP.get(website_url)
+            response.raise_for_status()
+
+            soup = BeautifulSoup(response.text, "html.parser")
+            for element in soup(["script", "style", "noscript"]):
+                element.decompose()
+
+            return soup.get_text(separator="\n", strip=True)
+
+        except Exception as e:
+            return f"Failed to scrape {website_url}: {str(e)}"
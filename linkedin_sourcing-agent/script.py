@@ -55,13 +55,13 @@ project_structure = {
     }
 }
 
-print("AI Sourcing Agent Project Structure:")
-print("=" * 50)
-
 def print_structure(structure, indent=0):
     for key, value in structure.items():
         print("  " * indent + f"├── {key}")
         if isinstance(value, dict) and value:
             print_structure(value, indent + 1)
 
-print_structure(project_structure)
\ No newline at end of file
+if __name__ == "__main__":
+    print("AI Sourcing Agent Project Structure:")
+    print("=" * 50)
+    print_structure(project_structure)
\ No newline at end of file
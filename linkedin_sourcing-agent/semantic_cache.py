@@ -0,0 +1,228 @@
+"""
+Semantic LLM Cache
+==================
+
+Reuses LLM responses for prompts that are worded differently but mean the
+same thing, using sentence embeddings and an HNSW nearest-neighbour index.
+"""
+
+import asyncio
+import sqlite3
+import string
+import threading
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, List, Optional
+import numpy as np
+
+from .logger import setup_logger
+
+# ANN search and the default embedding model are optional; without them the
+# cache is a pass-through
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+logger = setup_logger()
+
+DEFAULT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+DEFAULT_TTL = 7 * 86400  # 1 week
+
+# Nearest neighbours checked per lookup; the closest one may be expired or
+# belong to another scope
+SEARCH_NEIGHBOURS = 16
+
+_FILLER_WORDS = frozenset({
+    "a", "an", "the", "for", "of", "and", "or", "in", "on", "to", "with",
+    "please", "find", "search", "list", "some", "any", "me",
+})
+_PUNCTUATION = str.maketrans(string.punctuation, " " * len(string.punctuation))
+
+def canonicalize(prompt: str) -> str:
+    """Lowercase a prompt and drop punctuation and filler words before embedding"""
+    words = prompt.lower().translate(_PUNCTUATION).split()
+    return " ".join(word for word in words if word not in _FILLER_WORDS)
+
+class SemanticCache:
+    """
+    Cache of LLM responses looked up by cosine similarity of prompt embeddings
+    """
+
+    def __init__(self,
+                 db_path: str = "data/semantic_cache.db",
+                 model_name: str = DEFAULT_MODEL,
+                 threshold: float = 0.90,
+                 ttl: int = DEFAULT_TTL,
+                 max_entries: int = 10000,
+                 embed: Optional[Callable[[List[str]], np.ndarray]] = None):
+        """
+        Args:
+            db_path: SQLite file holding the cached prompts and responses
+            model_name: Embedding model; also keys the stored vectors
+            threshold: Minimum cosine similarity for a cache hit
+            ttl: Maximum age of a reusable response in seconds
+            max_entries: Entries kept before the oldest are evicted
+            embed: Embeds a list of texts (defaults to the sentence-transformers model)
+        """
+        self.enabled = faiss is not None and (embed is not None or SentenceTransformer is not None)
+        self.model_name = model_name
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._embed_fn = embed
+        self._index = None
+        # Deleted rows still in the index; it is rebuilt once they dominate
+        self._stale = 0
+
+        if not self.enabled:
+            logger.info("Semantic cache disabled (faiss / sentence-transformers not installed)")
+            return
+
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+
+            CREATE TABLE IF NOT EXISTS semantic_cache (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                model TEXT NOT NULL,
+                prompt TEXT NOT NULL,
+                embedding BLOB NOT NULL,
+                response TEXT NOT NULL,
+                scope TEXT NOT NULL DEFAULT '',
+                ts INTEGER NOT NULL DEFAULT 0
+            );
+        """)
+
+        # Entries from before scope/ts existed get ts 0, so they read as expired
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(semantic_cache)")}
+        with self._conn:
+            if "scope" not in columns:
+                self._conn.execute("ALTER TABLE semantic_cache ADD COLUMN scope TEXT NOT NULL DEFAULT ''")
+            if "ts" not in columns:
+                self._conn.execute("ALTER TABLE semantic_cache ADD COLUMN ts INTEGER NOT NULL DEFAULT 0")
+
+    def _load(self, dim: int):
+        """Rebuild the in-memory index from the unexpired SQLite rows"""
+        if self._index is not None:
+            return
+
+        self._index = faiss.IndexIDMap(faiss.IndexHNSWFlat(dim, 32, faiss.METRIC_INNER_PRODUCT))
+        self._stale = 0
+
+        rows = self._conn.execute(
+            "SELECT id, embedding FROM semantic_cache WHERE model = ? AND ts > ?",
+            (self.model_name, int(time.time()) - self.ttl)
+        ).fetchall()
+        if rows:
+            ids = np.array([row[0] for row in rows], dtype=np.int64)
+            vectors = np.vstack([np.frombuffer(row[1], dtype=np.float32) for row in rows])
+            self._index.add_with_ids(vectors, ids)
+
+        logger.info(f"Semantic cache loaded {len(rows)} entries")
+
+    def _embed(self, prompt: str) -> np.ndarray:
+        """Embed a canonicalized prompt as a unit-length float32 row vector"""
+        with self._lock:
+            if self._embed_fn is None:
+                model = SentenceTransformer(self.model_name)
+                self._embed_fn = lambda texts: model.encode(texts, normalize_embeddings=True)
+
+            vector = np.asarray(self._embed_fn([canonicalize(prompt)]), dtype=np.float32)
+            vector /= np.linalg.norm(vector, axis=1, keepdims=True)
+            self._load(vector.shape[1])
+        return vector
+
+    def lookup(self, embedding: np.ndarray, scope: str = "") -> Optional[str]:
+        """Return the response of the nearest unexpired cached prompt in the same scope, if similar enough"""
+        with self._lock:
+            if self._index is None or self._index.ntotal == 0:
+                return None
+
+            scores, ids = self._index.search(embedding, min(SEARCH_NEIGHBOURS, self._index.ntotal))
+            similar = {int(i): float(score) for score, i in zip(scores[0], ids[0]) if i >= 0 and score >= self.threshold}
+            if not similar:
+                return None
+
+            rows = self._conn.execute(
+                f"SELECT id, response FROM semantic_cache WHERE id IN ({', '.join('?' * len(similar))}) "
+                "AND scope = ? AND ts > ?",
+                (*similar, scope, int(time.time()) - self.ttl)
+            ).fetchall()
+        return max(rows, key=lambda row: similar[row[0]])[1] if rows else None
+
+    def store(self, prompt: str, embedding: np.ndarray, response: str, scope: str = ""):
+        """Persist a response, add its prompt embedding to the index and evict expired or excess entries"""
+        now = int(time.time())
+        with self._lock:
+            with self._conn:
+                cursor = self._conn.execute(
+                    "INSERT INTO semantic_cache (model, prompt, embedding, response, scope, ts) VALUES (?, ?, ?, ?, ?, ?)",
+                    (self.model_name, prompt, embedding.tobytes(), response, scope, now)
+                )
+                deleted = self._conn.execute(
+                    "DELETE FROM semantic_cache WHERE ts <= ?", (now - self.ttl,)
+                ).rowcount
+                deleted += self._conn.execute(
+                    "DELETE FROM semantic_cache WHERE id IN "
+                    "(SELECT id FROM semantic_cache ORDER BY id DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                ).rowcount
+
+            if self._index is None:
+                return
+            self._index.add_with_ids(embedding, np.array([cursor.lastrowid], dtype=np.int64))
+
+            # HNSW cannot remove vectors: lookups skip deleted ids, and the
+            # index is rebuilt from SQLite once they make up half of it
+            self._stale += deleted
+            if self._stale * 2 > self._index.ntotal:
+                self._index = None
+
+    async def ask(self, prompt: str, call_llm: Callable[[], Awaitable[str]], scope: str = "") -> str:
+        """
+        Return a cached response for a similar prompt, otherwise call the LLM and cache it
+
+        Args:
+            prompt: Text compared by embedding similarity
+            call_llm: Produces the response on a miss
+            scope: Must match exactly for a hit (e.g. a location the prompt depends on)
+        """
+        if not self.enabled:
+            return await call_llm()
+
+        try:
+            embedding = await asyncio.to_thread(self._embed, prompt)
+            cached = await asyncio.to_thread(self.lookup, embedding, scope)
+            if cached is not None:
+                logger.info(f"Semantic cache hit for '{prompt}' ({scope})")
+                return cached
+        except Exception as e:
+            logger.warning(f"Semantic cache lookup failed: {e}")
+            return await call_llm()
+
+        response = await call_llm()
+        if not response.strip():
+            return response
+
+        try:
+            await asyncio.to_thread(self.store, prompt, embedding, response, scope)
+        except Exception as e:
+            logger.warning(f"Semantic cache store failed: {e}")
+
+        return response
+
+    def close(self):
+        """Close the cache database"""
+        if self.enabled:
+            self._conn.close()
@@ -36,8 +36,9 @@ setup(
     extras_require={
         "dev": [
             "pytest>=7.4.0",
-            "pytest-asyncio>=0.21.0",
+            "pytest-asyncio>=0.26.0",
             "pytest-cov>=4.1.0",
+            "pytest-xdist>=3.5.0",
             "black>=23.0.0",
             "flake8>=6.0.0",
             "mypy>=1.5.0",
@@ -46,6 +47,14 @@ setup(
             "sphinx>=7.0.0",
             "sphinx-rtd-theme>=1.3.0",
         ],
+        # Optional accelerators: the code falls back when these are missing
+        "semantic": [
+            "faiss-cpu>=1.7.4",
+            "sentence-transformers>=2.2.0",
+        ],
+        "re2": [
+            "google-re2>=1.1",
+        ],
     },
     entry_points={
         "console_scripts": [
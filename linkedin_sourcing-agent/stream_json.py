@@ -0,0 +1,42 @@
+"""
+Streaming JSON Writer
+=====================
+
+Writes sourcing reports to disk incrementally, one supplier at a time.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, Union
+import orjson
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+def _dumps(value: Any) -> bytes:
+    """Serialize a single value, falling back to str() for unknown types"""
+    return orjson.dumps(value, default=str, option=_OPTIONS)
+
+def write_report(
+    path: Union[str, Path],
+    summary_fields: Dict[str, Any],
+    supplier_iter: Iterable[Any],
+    list_key: str = "top_suppliers"
+) -> None:
+    """
+    Write a report as a JSON object without serializing it all at once
+
+    Args:
+        path: Destination file path
+        summary_fields: Top-level fields written before the supplier list
+        supplier_iter: Suppliers to stream into the list, one encoded at a time
+        list_key: Key of the streamed supplier list
+    """
+    with open(path, "wb") as f:
+        f.write(b"{\n")
+        for key, value in summary_fields.items():
+            f.write(b"  " + _dumps(str(key)) + b": " + _dumps(value) + b",\n")
+
+        f.write(b"  " + _dumps(list_key) + b": [")
+        for i, supplier in enumerate(supplier_iter):
+            f.write(b"\n    " if i == 0 else b",\n    ")
+            f.write(_dumps(supplier))
+        f.write(b"\n  ]\n}\n")
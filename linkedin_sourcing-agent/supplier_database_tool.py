@@ -5,12 +5,232 @@ Supplier Database Tool
 Manages supplier data storage and retrieval.
 """
 
+import atexit
 import sqlite3
-import json
-from typing import List, Dict, Optional
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from typing import List, Dict, Optional, Tuple
 from pathlib import Path
+import aiosqlite
+import orjson
 from crewai_tools import BaseTool
 
+# zstd compression of the free-form JSON columns is optional
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Applied to every connection: WAL turns commits into log appends instead of
+# full fsync barriers, and the larger page cache keeps hot pages in memory
+CONNECTION_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-65536;
+"""
+
+INSERT_SQL = """
+    INSERT INTO suppliers (
+        name, website, country, city, product_categories,
+        contact_info, certifications, capabilities,
+        financial_info, risk_assessment, performance_scores
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+SUPPLIER_COLUMNS = (
+    "name", "website", "country", "city", "product_categories",
+    "contact_info", "certifications", "capabilities",
+    "financial_info", "risk_assessment", "performance_scores"
+)
+
+TIMESTAMP_COLUMNS = ("created_at", "updated_at")
+
+UPDATE_COLUMNS = SUPPLIER_COLUMNS + TIMESTAMP_COLUMNS
+
+SELECT_COLUMNS_SQL = f"SELECT {', '.join(SUPPLIER_COLUMNS)} FROM suppliers WHERE id = ?"
+
+# Fixed-shape update: one cached statement whatever subset of fields changes.
+# Timestamps not given in the update are passed as NULL: created_at then keeps
+# its stored value and updated_at is set to the current time.
+UPSERT_SQL = f"""
+    INSERT INTO suppliers (id, {', '.join(UPDATE_COLUMNS)})
+    VALUES (?, {', '.join('?' * len(UPDATE_COLUMNS))})
+    ON CONFLICT(id) DO UPDATE SET
+        {', '.join(f'{column} = excluded.{column}' for column in SUPPLIER_COLUMNS)},
+        created_at = COALESCE(excluded.created_at, created_at),
+        updated_at = COALESCE(excluded.updated_at, CURRENT_TIMESTAMP)
+"""
+
+def _dumps(value) -> str:
+    """Serialize a nested field for storage in a TEXT column"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+# Free-form JSON columns stored zstd-compressed. product_categories stays plain
+# text because the FTS index reads it directly.
+COMPRESSED_COLUMNS = frozenset({
+    "contact_info", "certifications", "capabilities",
+    "financial_info", "risk_assessment", "performance_scores"
+})
+
+# Rows needed before a compression dictionary is worth training
+DICTIONARY_SAMPLE_ROWS = 100
+DICTIONARY_SIZE = 16384
+
+class _BlobCodec:
+    """zstd codec for JSON column values, using a trained dictionary when one exists"""
+
+    def __init__(self, dict_data: Optional[bytes] = None):
+        self._dict = None
+        # Compressor objects are costly to build and not thread-safe: keep one per thread
+        self._local = threading.local()
+        if zstandard is not None and dict_data is not None:
+            self._dict = zstandard.ZstdCompressionDict(dict_data)
+
+    @property
+    def has_dictionary(self) -> bool:
+        """Whether a trained dictionary is loaded"""
+        return self._dict is not None
+
+    def set_dictionary(self, dict_data: bytes):
+        """Use a trained dictionary for subsequent reads and writes"""
+        self._dict = zstandard.ZstdCompressionDict(dict_data)
+        self._local = threading.local()
+
+    def _codecs(self):
+        codecs = getattr(self._local, "codecs", None)
+        if codecs is None:
+            codecs = (
+                zstandard.ZstdCompressor(level=3, dict_data=self._dict),
+                zstandard.ZstdDecompressor(dict_data=self._dict),
+            )
+            self._local.codecs = codecs
+        return codecs
+
+    def encode(self, text: str):
+        """Return compressed bytes, or the text itself when compression does not help"""
+        if zstandard is None:
+            return text
+        data = text.encode("utf-8")
+        packed = self._codecs()[0].compress(data)
+        return packed if len(packed) < len(data) else text
+
+    def decode(self, value):
+        """Return the JSON text of a stored value (compressed values are BLOBs)"""
+        if isinstance(value, bytes):
+            return self._codecs()[1].decompress(value).decode("utf-8")
+        return value
+
+def _encode_value(column: str, value, codec: _BlobCodec):
+    """Serialize a field for storage, compressing the free-form JSON columns"""
+    if isinstance(value, (dict, list)):
+        value = _dumps(value)
+    if column in COMPRESSED_COLUMNS and isinstance(value, str):
+        return codec.encode(value)
+    return value
+
+def _encode_row(supplier_data: Dict, codec: _BlobCodec) -> tuple:
+    """Convert a supplier dict into INSERT_SQL parameters, JSON-encoding nested fields"""
+    return (
+        supplier_data.get("name"),
+        supplier_data.get("website"),
+        supplier_data.get("country"),
+        supplier_data.get("city"),
+        _dumps(supplier_data.get("product_categories", [])),
+        _encode_value("contact_info", supplier_data.get("contact_info", {}), codec),
+        _encode_value("certifications", supplier_data.get("certifications", []), codec),
+        _encode_value("capabilities", supplier_data.get("capabilities", {}), codec),
+        _encode_value("financial_info", supplier_data.get("financial_info", {}), codec),
+        _encode_value("risk_assessment", supplier_data.get("risk_assessment", {}), codec),
+        _encode_value("performance_scores", supplier_data.get("performance_scores", {}), codec)
+    )
+
+SEARCH_LIMIT = 50
+
+def _fts_query(query: str) -> str:
+    """Turn free text into an FTS5 query: every word must match as a prefix"""
+    terms = query.split()
+    return " ".join('"' + term.replace('"', '""') + '"*' for term in terms)
+
+def _search_sql(query: str, country: Optional[str] = None) -> Tuple[str, tuple]:
+    """Build the search statement and parameters for a query and optional country"""
+    match = _fts_query(query)
+    if match:
+        where, params = "suppliers_fts MATCH ?", (match,)
+        if country:
+            where += " AND s.country = ? COLLATE NOCASE"
+            params += (country,)
+        return f"""
+            SELECT s.id, s.name, s.website, s.country, s.product_categories
+            FROM suppliers_fts
+            JOIN suppliers s ON s.id = suppliers_fts.rowid
+            WHERE {where}
+            ORDER BY suppliers_fts.rank
+            LIMIT ?
+        """, params + (SEARCH_LIMIT,)
+    elif country:
+        return """
+            SELECT id, name, website, country, product_categories
+            FROM suppliers
+            WHERE country = ? COLLATE NOCASE
+            ORDER BY name COLLATE NOCASE
+            LIMIT ?
+        """, (country, SEARCH_LIMIT)
+    return """
+        SELECT id, name, website, country, product_categories
+        FROM suppliers
+        ORDER BY name COLLATE NOCASE
+        LIMIT ?
+    """, (SEARCH_LIMIT,)
+
+def _search_rows(results: List[tuple]) -> List[Dict]:
+    """Convert search rows into supplier dicts, decoding the stored categories"""
+    return [
+        {
+            "id": row[0],
+            "name": row[1],
+            "website": row[2],
+            "country": row[3],
+            "product_categories": orjson.loads(row[4]) if row[4] else [],
+        }
+        for row in results
+    ]
+
+def _format_search_results(suppliers: List[Dict]) -> str:
+    """Render search results as a JSON array for the agent"""
+    if not suppliers:
+        return "No suppliers found matching the query"
+    return orjson.dumps(suppliers).decode()
+
+def _check_update(update_data: Dict) -> Optional[str]:
+    """Return an error message if an update request is invalid, otherwise None"""
+    if not update_data.get("id"):
+        return "Supplier ID is required for update"
+
+    fields = update_data.keys() - {"id"}
+    if not fields:
+        return "No fields to update"
+
+    unknown = fields - set(UPDATE_COLUMNS)
+    if unknown:
+        return f"Unknown supplier fields: {', '.join(sorted(unknown))}"
+    return None
+
+def _merge_update(current: tuple, update_data: Dict, codec: _BlobCodec) -> tuple:
+    """Overlay update fields on a stored row, returning UPSERT_SQL parameters"""
+    merged = dict.fromkeys(TIMESTAMP_COLUMNS)
+    merged.update(zip(SUPPLIER_COLUMNS, current))
+    for key, value in update_data.items():
+        if key != "id":
+            merged[key] = _encode_value(key, value, codec)
+    return (update_data["id"], *(merged[column] for column in UPDATE_COLUMNS))
+
+def _stored_message(count: int, last_id: int) -> str:
+    """Describe the IDs assigned to a batch of inserted suppliers"""
+    if count == 1:
+        return f"Supplier stored successfully with ID: {last_id}"
+    return f"{count} suppliers stored successfully (IDs {last_id - count + 1}-{last_id})"
+
 class SupplierDatabaseTool(BaseTool):
     """
     Tool for managing supplier database operations
@@ -23,12 +243,88 @@ class SupplierDatabaseTool(BaseTool):
         super().__init__()
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # One long-lived connection shared by all actions; the lock serializes
+        # access since agents may call the tool from worker threads
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        atexit.register(self._conn.close)
         self._init_database()
 
+        with self._cursor() as cursor:
+            row = cursor.execute("SELECT data FROM compression_dictionary WHERE id = 1").fetchone()
+        self._codec = _BlobCodec(row[0] if row else None)
+        if zstandard is not None and not self._codec.has_dictionary:
+            self.train_compression_dictionary()
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    def train_compression_dictionary(self) -> str:
+        """Train the zstd dictionary from stored JSON values once enough rows exist"""
+        if zstandard is None:
+            return "zstandard is not installed"
+        # Values written with the existing dictionary can only be read with it
+        if self._codec.has_dictionary:
+            return "Compression dictionary already exists"
+
+        try:
+            columns = ", ".join(sorted(COMPRESSED_COLUMNS))
+            with self._cursor() as cursor:
+                rows = cursor.execute(
+                    f"SELECT {columns} FROM suppliers ORDER BY id DESC LIMIT 1000"
+                ).fetchall()
+
+            if len(rows) < DICTIONARY_SAMPLE_ROWS:
+                return f"Need at least {DICTIONARY_SAMPLE_ROWS} suppliers to train, found {len(rows)}"
+
+            samples = [
+                self._codec.decode(value).encode("utf-8")
+                for row in rows for value in row if value is not None
+            ]
+            dict_data = zstandard.train_dictionary(DICTIONARY_SIZE, samples).as_bytes()
+            # Stored in the database itself so compressed rows never outlive their dictionary
+            with self._cursor(write=True) as cursor:
+                cursor.execute("INSERT INTO compression_dictionary (id, data) VALUES (1, ?)", (dict_data,))
+            self._codec.set_dictionary(dict_data)
+            return f"Trained compression dictionary from {len(rows)} suppliers"
+        except Exception as e:
+            return f"Error training compression dictionary: {str(e)}"
+
+    @contextmanager
+    def _cursor(self, write: bool = False):
+        """Yield a cursor on the shared connection, inside a write transaction if requested"""
+        with self._lock:
+            cursor = self._conn.cursor()
+            try:
+                if not write:
+                    yield cursor
+                    return
+
+                cursor.execute("BEGIN IMMEDIATE")
+                try:
+                    yield cursor
+                    cursor.execute("COMMIT")
+                except Exception:
+                    cursor.execute("ROLLBACK")
+                    raise
+            finally:
+                cursor.close()
+
+    @asynccontextmanager
+    async def _aconnect(self):
+        """Open an aiosqlite connection (runs SQLite on its own thread, off the event loop)"""
+        async with aiosqlite.connect(self.db_path, isolation_level=None) as db:
+            await db.executescript(CONNECTION_PRAGMAS)
+            yield db
+
     def _init_database(self):
         """Initialize the supplier database"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
+        with self._lock:
+            self._conn.executescript(CONNECTION_PRAGMAS)
+            self._conn.executescript("""
                 CREATE TABLE IF NOT EXISTS suppliers (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     name TEXT NOT NULL,
@@ -44,10 +340,8 @@ class SupplierDatabaseTool(BaseTool):
                     performance_scores TEXT,
                     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
                     updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
+                );
 
-            conn.execute("""
                 CREATE TABLE IF NOT EXISTS evaluations (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     supplier_id INTEGER,
@@ -56,21 +350,80 @@ class SupplierDatabaseTool(BaseTool):
                     notes TEXT,
                     evaluated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
                     FOREIGN KEY (supplier_id) REFERENCES suppliers (id)
-                )
+                );
+
+                -- zstd dictionary the compressed JSON columns were written with
+                CREATE TABLE IF NOT EXISTS compression_dictionary (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    data BLOB NOT NULL
+                );
+            """)
+
+            fts_exists = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'suppliers_fts'"
+            ).fetchone()
+
+            # Full-text index over the searchable columns, kept in sync by triggers
+            self._conn.executescript("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS suppliers_fts USING fts5(
+                    name, country, product_categories,
+                    content='suppliers', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2'
+                );
+
+                CREATE TRIGGER IF NOT EXISTS suppliers_fts_insert AFTER INSERT ON suppliers BEGIN
+                    INSERT INTO suppliers_fts (rowid, name, country, product_categories)
+                    VALUES (new.id, new.name, new.country, new.product_categories);
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS suppliers_fts_delete AFTER DELETE ON suppliers BEGIN
+                    INSERT INTO suppliers_fts (suppliers_fts, rowid, name, country, product_categories)
+                    VALUES ('delete', old.id, old.name, old.country, old.product_categories);
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS suppliers_fts_update AFTER UPDATE ON suppliers BEGIN
+                    INSERT INTO suppliers_fts (suppliers_fts, rowid, name, country, product_categories)
+                    VALUES ('delete', old.id, old.name, old.country, old.product_categories);
+                    INSERT INTO suppliers_fts (rowid, name, country, product_categories)
+                    VALUES (new.id, new.name, new.country, new.product_categories);
+                END;
+            """)
+
+            # Index rows that predate the FTS table
+            if not fts_exists:
+                self._conn.execute("INSERT INTO suppliers_fts (suppliers_fts) VALUES ('rebuild')")
+
+            indexes_exist = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_suppliers_country_nocase'"
+            ).fetchone()
+
+            # Ordered indexes for the country filter and name sort in searches;
+            # both compare case-insensitively, matching the search statements
+            self._conn.executescript("""
+                DROP INDEX IF EXISTS idx_suppliers_country_name;
+                CREATE INDEX IF NOT EXISTS idx_suppliers_country_nocase
+                    ON suppliers (country COLLATE NOCASE, name COLLATE NOCASE);
+                CREATE INDEX IF NOT EXISTS idx_suppliers_name ON suppliers (name COLLATE NOCASE);
             """)
 
+            # Give the planner statistics for the new indexes
+            if not indexes_exist:
+                self._conn.execute("ANALYZE")
+
     def _run(self, action: str, **kwargs) -> str:
         """
         Execute database operations
 
         Args:
-            action: The action to perform ('store', 'search', 'get', 'update')
+            action: The action to perform ('store', 'store_bulk', 'search', 'get', 'update')
             **kwargs: Additional parameters based on action
         """
         if action == "store":
             return self._store_supplier(kwargs)
+        elif action == "store_bulk":
+            return self._store_suppliers_bulk(kwargs.get("rows", []))
         elif action == "search":
-            return self._search_suppliers(kwargs.get("query", ""))
+            return self._search_suppliers(kwargs.get("query", ""), kwargs.get("country"))
         elif action == "get":
             return self._get_supplier(kwargs.get("supplier_id"))
         elif action == "update":
@@ -78,112 +431,169 @@ class SupplierDatabaseTool(BaseTool):
         else:
             return f"Unknown action: {action}"
 
+    async def _arun(self, action: str, **kwargs) -> str:
+        """
+        Execute database operations without blocking the event loop
+
+        Args:
+            action: The action to perform ('store', 'store_bulk', 'search', 'get', 'update')
+            **kwargs: Additional parameters based on action
+        """
+        if action == "store":
+            return await self._astore_supplier(kwargs)
+        elif action == "store_bulk":
+            return await self._astore_suppliers_bulk(kwargs.get("rows", []))
+        elif action == "search":
+            return await self._asearch_suppliers(kwargs.get("query", ""), kwargs.get("country"))
+        elif action == "get":
+            return await self._aget_supplier(kwargs.get("supplier_id"))
+        elif action == "update":
+            return await self._aupdate_supplier(kwargs)
+        else:
+            return f"Unknown action: {action}"
+
     def _store_supplier(self, supplier_data: Dict) -> str:
         """Store supplier information in database"""
+        return self._store_suppliers_bulk([supplier_data])
+
+    def _store_suppliers_bulk(self, rows: List[Dict]) -> str:
+        """Store many suppliers with one prepared statement in a single transaction"""
+        try:
+            if not rows:
+                return "No suppliers to store"
+
+            params = [_encode_row(row, self._codec) for row in rows]
+            with self._cursor(write=True) as cursor:
+                cursor.executemany(INSERT_SQL, params)
+                last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+
+            return _stored_message(len(rows), last_id)
+        except Exception as e:
+            return f"Error storing supplier: {str(e)}"
+
+    async def _astore_supplier(self, supplier_data: Dict) -> str:
+        """Store supplier information in database (async)"""
+        return await self._astore_suppliers_bulk([supplier_data])
+
+    async def _astore_suppliers_bulk(self, rows: List[Dict]) -> str:
+        """Store many suppliers in a single transaction (async)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO suppliers (
-                        name, website, country, city, product_categories,
-                        contact_info, certifications, capabilities,
-                        financial_info, risk_assessment, performance_scores
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    supplier_data.get("name"),
-                    supplier_data.get("website"),
-                    supplier_data.get("country"),
-                    supplier_data.get("city"),
-                    json.dumps(supplier_data.get("product_categories", [])),
-                    json.dumps(supplier_data.get("contact_info", {})),
-                    json.dumps(supplier_data.get("certifications", [])),
-                    json.dumps(supplier_data.get("capabilities", {})),
-                    json.dumps(supplier_data.get("financial_info", {})),
-                    json.dumps(supplier_data.get("risk_assessment", {})),
-                    json.dumps(supplier_data.get("performance_scores", {}))
-                ))
-                supplier_id = cursor.lastrowid
-                return f"Supplier stored successfully with ID: {supplier_id}"
+            if not rows:
+                return "No suppliers to store"
+
+            params = [_encode_row(row, self._codec) for row in rows]
+            async with self._aconnect() as db:
+                await db.execute("BEGIN IMMEDIATE")
+                try:
+                    await db.executemany(INSERT_SQL, params)
+                    (last_id,), = await db.execute_fetchall("SELECT last_insert_rowid()")
+                    await db.execute("COMMIT")
+                except Exception:
+                    await db.execute("ROLLBACK")
+                    raise
+
+            return _stored_message(len(rows), last_id)
         except Exception as e:
             return f"Error storing supplier: {str(e)}"
 
-    def _search_suppliers(self, query: str) -> str:
-        """Search for suppliers based on query"""
+    def _search_suppliers(self, query: str, country: Optional[str] = None) -> str:
+        """Search for suppliers based on query, optionally limited to one country"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT id, name, website, country, product_categories
-                    FROM suppliers
-                    WHERE name LIKE ? OR product_categories LIKE ? OR country LIKE ?
-                    ORDER BY name
-                """, (f"%{query}%", f"%{query}%", f"%{query}%"))
-
-                results = cursor.fetchall()
-                if not results:
-                    return "No suppliers found matching the query"
-
-                formatted_results = []
-                for row in results:
-                    formatted_results.append(f"""
-ID: {row[0]}
-Name: {row[1]}
-Website: {row[2]}
-Country: {row[3]}
-Categories: {row[4]}
-""")
-
-                return "\n".join(formatted_results)
+            sql, params = _search_sql(query, country)
+            with self._cursor() as cursor:
+                results = cursor.execute(sql, params).fetchall()
+
+            return _format_search_results(_search_rows(results))
         except Exception as e:
             return f"Error searching suppliers: {str(e)}"
 
+    async def _asearch_suppliers(self, query: str, country: Optional[str] = None) -> str:
+        """Search for suppliers based on query (async)"""
+        try:
+            return _format_search_results(await self._asearch_suppliers_raw(query, country))
+        except Exception as e:
+            return f"Error searching suppliers: {str(e)}"
+
+    async def _asearch_suppliers_raw(self, query: str, country: Optional[str] = None) -> List[Dict]:
+        """Search for suppliers and return the matching supplier dicts (for in-process callers)"""
+        sql, params = _search_sql(query, country)
+        async with self._aconnect() as db:
+            results = await db.execute_fetchall(sql, params)
+
+        return _search_rows(results)
+
     def _get_supplier(self, supplier_id: int) -> str:
         """Get detailed supplier information"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM suppliers WHERE id = ?", (supplier_id,))
-                result = cursor.fetchone()
+            with self._cursor() as cursor:
+                result = cursor.execute(
+                    "SELECT * FROM suppliers WHERE id = ?", (supplier_id,)
+                ).fetchone()
+
+            if not result:
+                return f"Supplier with ID {supplier_id} not found"
+
+            return f"Supplier details: {tuple(self._codec.decode(value) for value in result)}"
+        except Exception as e:
+            return f"Error retrieving supplier: {str(e)}"
+
+    async def _aget_supplier(self, supplier_id: int) -> str:
+        """Get detailed supplier information (async)"""
+        try:
+            async with self._aconnect() as db:
+                results = await db.execute_fetchall(
+                    "SELECT * FROM suppliers WHERE id = ?", (supplier_id,)
+                )
 
-                if not result:
-                    return f"Supplier with ID {supplier_id} not found"
+            if not results:
+                return f"Supplier with ID {supplier_id} not found"
 
-                return f"Supplier details: {result}"
+            return f"Supplier details: {tuple(self._codec.decode(value) for value in results[0])}"
         except Exception as e:
             return f"Error retrieving supplier: {str(e)}"
 
     def _update_supplier(self, update_data: Dict) -> str:
         """Update supplier information"""
         try:
-            supplier_id = update_data.get("id")
-            if not supplier_id:
-                return "Supplier ID is required for update"
-
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-
-                # Build dynamic update query
-                fields = []
-                values = []
-                for key, value in update_data.items():
-                    if key != "id":
-                        fields.append(f"{key} = ?")
-                        if isinstance(value, (dict, list)):
-                            values.append(json.dumps(value))
-                        else:
-                            values.append(value)
-
-                if not fields:
-                    return "No fields to update"
-
-                query = f"UPDATE suppliers SET {', '.join(fields)} WHERE id = ?"
-                values.append(supplier_id)
-
-                cursor.execute(query, values)
-
-                if cursor.rowcount > 0:
-                    return f"Supplier {supplier_id} updated successfully"
-                else:
-                    return f"Supplier {supplier_id} not found"
+            error = _check_update(update_data)
+            if error:
+                return error
+
+            supplier_id = update_data["id"]
+            with self._cursor(write=True) as cursor:
+                current = cursor.execute(SELECT_COLUMNS_SQL, (supplier_id,)).fetchone()
+                if current is not None:
+                    cursor.execute(UPSERT_SQL, _merge_update(current, update_data, self._codec))
+
+            if current is not None:
+                return f"Supplier {supplier_id} updated successfully"
+            else:
+                return f"Supplier {supplier_id} not found"
+        except Exception as e:
+            return f"Error updating supplier: {str(e)}"
+
+    async def _aupdate_supplier(self, update_data: Dict) -> str:
+        """Update supplier information (async)"""
+        try:
+            error = _check_update(update_data)
+            if error:
+                return error
+
+            supplier_id = update_data["id"]
+            async with self._aconnect() as db:
+                await db.execute("BEGIN IMMEDIATE")
+                try:
+                    rows = await db.execute_fetchall(SELECT_COLUMNS_SQL, (supplier_id,))
+                    if rows:
+                        await db.execute(UPSERT_SQL, _merge_update(tuple(rows[0]), update_data, self._codec))
+                    await db.execute("COMMIT")
+                except Exception:
+                    await db.execute("ROLLBACK")
+                    raise
+
+            if rows:
+                return f"Supplier {supplier_id} updated successfully"
+            else:
+                return f"Supplier {supplier_id} not found"
         except Exception as e:
             return f"Error updating supplier: {str(e)}"
@@ -8,27 +8,39 @@ Comprehensive tests for all components of the AI Sourcing Agent.
 import pytest
 import asyncio
 from unittest.mock import Mock, AsyncMock, patch
+import gc
 import json
 import tempfile
 import os
+import threading
+import types
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import redis
 
 # Import modules to test
 from src.crew_manager import SourcingCrewManager
 from src.tools.web_search import WebSearchTool
+from src.tools.scrape_website import WebsiteScraperTool
 from src.tools.supplier_database import SupplierDatabaseTool
-from src.utils.config import Config
+from src.utils.config import Config, get_config
+from src.utils.stream_json import write_report
+from src.utils.llm_cache import LLMCache
+from src.utils.semantic_cache import SemanticCache, canonicalize
+from src.utils.plan_cache import PlanCache
+from main import SourcingAgent, _top_suppliers
 
 class TestSourcingCrewManager:
     """Test the main crew manager functionality"""
     
-    @pytest.fixture
-    def crew_manager(self):
-        """Create a test crew manager instance"""
-        with patch.dict(os.environ, {
-            'OPENAI_API_KEY': 'test_key',
-            'TAVILY_API_KEY': 'test_key'
-        }):
-            return SourcingCrewManager()
+    @pytest.fixture(scope="module")
+    def crew_manager(self, tmp_path_factory):
+        """Create one crew manager shared by the module (tests must patch, not assign, its attributes)"""
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setenv('OPENAI_API_KEY', 'test_key')
+            mp.setenv('TAVILY_API_KEY', 'test_key')
+            # Keep the persistent LLM caches out of the working directory
+            return SourcingCrewManager(cache_dir=str(tmp_path_factory.mktemp("cache")))
     
     def test_initialization(self, crew_manager):
         """Test crew manager initialization"""
@@ -36,6 +48,15 @@ class TestSourcingCrewManager:
         assert hasattr(crew_manager, 'config')
         assert hasattr(crew_manager, 'agents')
         assert hasattr(crew_manager, 'tools')
+        assert set(crew_manager.crews) == set(crew_manager.agents)
+    
+    def test_use_cache_false_disables_every_cache(self, monkeypatch, tmp_path):
+        """Test that opting out of caching skips the Redis, LLM and semantic caches"""
+        monkeypatch.setenv('OPENAI_API_KEY', 'test_key')
+        manager = SourcingCrewManager(use_cache=False, cache_dir=str(tmp_path))
+        
+        assert (manager.cache, manager.llm_cache, manager.semantic_cache) == (None, None, None)
+        assert not any(tmp_path.iterdir())
     
     @pytest.mark.asyncio
     async def test_research_suppliers(self, crew_manager):
@@ -88,13 +109,91 @@ class TestSourcingCrewManager:
             assert isinstance(analysis, dict)
             assert 'total_suppliers' in analysis
 
+    @pytest.mark.asyncio
+    async def test_cached_kickoff_hit(self, crew_manager):
+        """Test that a cached crew result skips the crew run"""
+        cache = Mock()
+        cache.get.return_value = b"cached result"
+        task = Mock(description="task prompt", expected_output="supplier list")
+        task.agent.configure_mock(role="Senior Sourcing Researcher", goal="find suppliers",
+                                  backstory="researcher", tools=[])
+        
+        with patch.object(crew_manager, 'cache', cache), \
+             patch.object(crew_manager, '_run_crew') as mock_run:
+            result = await crew_manager._cached_kickoff('researcher', task)
+        
+        assert result == "cached result"
+        mock_run.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_fork_runs_do_not_block_original(self, crew_manager):
+        """Test that an in-flight run on a forked manager does not hold up the original's crews"""
+        forked = crew_manager.fork()
+        crew = Mock()
+        crew.kickoff.return_value = "analysis"
+        
+        # Holding the fork's lock stands in for an abandoned speculative kickoff
+        with forked._crew_locks['analyst'], \
+             patch.object(crew_manager, 'llm_cache', None), \
+             patch.dict(crew_manager.crews, {'analyst': crew}):
+            result = await asyncio.wait_for(
+                asyncio.to_thread(crew_manager._run_crew, 'analyst', Mock()), timeout=5
+            )
+        
+        assert result == "analysis"
+        assert forked.crews['analyst'] is not crew
+    
+    def test_cache_key_covers_task_template(self, crew_manager):
+        """Test that changing the expected output or agent goal changes the Redis key"""
+        task = Mock(description="task prompt", expected_output="supplier list")
+        task.agent.configure_mock(role="Senior Sourcing Researcher", goal="find suppliers",
+                                  backstory="researcher", tools=[])
+        key = crew_manager._cache_key('researcher', task)
+        
+        task.expected_output = "supplier table"
+        assert crew_manager._cache_key('researcher', task) != key
+        task.expected_output = "supplier list"
+        task.agent.goal = "find distributors"
+        assert crew_manager._cache_key('researcher', task) != key
+    
+    def test_unreachable_redis_disables_cache(self, crew_manager):
+        """Test that a Redis server that cannot be reached is dropped once at startup"""
+        with patch('redis.Redis.from_url') as mock_from_url:
+            mock_from_url.return_value.ping.side_effect = redis.ConnectionError("refused")
+            assert crew_manager._initialize_cache() is None
+    
+    def test_parse_supplier_list(self, crew_manager):
+        """Test parsing a numbered supplier list from agent output"""
+        raw_result = """
+1. **Acme Sensors GmbH** - Munich, Germany
+   - Website: https://acme-sensors.de
+   - Specialties: pressure sensors
+2. Shenzhen Widget Co. | Shenzhen, China
+   Contact: see https://widget.cn
+"""
+        
+        suppliers = crew_manager._parse_supplier_list(raw_result)
+        
+        assert [s['name'] for s in suppliers] == ['Acme Sensors GmbH', 'Shenzhen Widget Co.']
+        assert suppliers[0]['location'] == 'Munich, Germany'
+        assert suppliers[0]['website'] == 'https://acme-sensors.de'
+        assert suppliers[1]['website'] == 'https://widget.cn'
+
 class TestWebSearchTool:
     """Test the web search tool functionality"""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def search_tool(self):
-        """Create a test search tool instance"""
-        return WebSearchTool()
+        """Create one search tool shared by the module"""
+        tool = WebSearchTool()
+        yield tool
+        asyncio.run(tool.aclose())
+    
+    @pytest.fixture(autouse=True)
+    def _clear_cache(self, search_tool):
+        """Keep cached results from leaking between tests"""
+        yield
+        search_tool.cache_clear()
     
     def test_initialization(self, search_tool):
         """Test search tool initialization"""
@@ -104,9 +203,10 @@ class TestWebSearchTool:
     @pytest.mark.asyncio
     async def test_search_functionality(self, search_tool):
         """Test basic search functionality"""
-        with patch('duckduckgo_search.DDGS') as mock_ddgs:
+        with patch('src.tools.web_search.DDGS') as mock_ddgs_class, \
+             patch.object(search_tool, 'ddgs_clients', threading.local()):
             # Mock search results
-            mock_ddgs.return_value.text.return_value = [
+            mock_ddgs_class.return_value.text.return_value = [
                 {
                     'title': 'Test Supplier Company',
                     'href': 'https://test-supplier.com',
@@ -119,11 +219,27 @@ class TestWebSearchTool:
             assert isinstance(result, str)
             assert 'Test Supplier Company' in result or 'Search failed' in result
     
+    def test_ddgs_client_per_thread(self, search_tool):
+        """Test that each thread reuses its own DuckDuckGo client"""
+        with patch('src.tools.web_search.DDGS', side_effect=object), \
+             patch.object(search_tool, 'ddgs_clients', threading.local()):
+            client = search_tool._get_ddgs()
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                worker_client = pool.submit(search_tool._get_ddgs).result()
+            
+            assert search_tool._get_ddgs() is client
+            assert worker_client is not client
+    
     @pytest.mark.asyncio
     async def test_supplier_search(self, search_tool):
         """Test specialized supplier search"""
-        with patch.object(search_tool, '_search_async') as mock_search:
-            mock_search.return_value = "Mocked search results"
+        with patch.object(search_tool, '_search_duckduckgo') as mock_search:
+            # Every query variant returns the same supplier with a slightly different URL
+            mock_search.side_effect = lambda query, max_results: [
+                {'title': 'Sensor Co', 'url': 'https://Sensor.co/', 'snippet': query},
+                {'title': 'Sensor Co', 'url': 'https://sensor.co', 'snippet': query},
+                {'title': 'Directory listing', 'url': '', 'snippet': query}
+            ]
             
             results = await search_tool.search_suppliers(
                 'industrial sensors', 
@@ -131,136 +247,494 @@ class TestWebSearchTool:
             )
             
             assert isinstance(results, list)
-            assert len(results) > 0
+            assert mock_search.call_count == 4
+            # URL-less results are never merged
+            assert [r['title'] for r in results] == ['Sensor Co'] + ['Directory listing'] * 4
+    
+    @pytest.mark.asyncio
+    async def test_repeated_search_is_cached(self, search_tool):
+        """Test that a repeated query is answered without searching again"""
+        with patch.object(search_tool, '_search_duckduckgo') as mock_search:
+            mock_search.return_value = [
+                {'title': 'Sensor Co', 'url': 'https://sensor.co', 'snippet': 'Sensors'}
+            ]
+            
+            first = await search_tool._search_async('Industrial sensors', 5)
+            second = await search_tool._search_async('industrial sensors ', 5)
+            
+            assert first == second
+            assert 'Sensor Co' in first
+            assert mock_search.call_count == 1
+
+class TestWebsiteScraperTool:
+    """Test the website scraper tool functionality"""
+    
+    def test_scrape_returns_page_text(self):
+        """Test that scraping strips markup and scripts"""
+        scraper = WebsiteScraperTool()
+        response = Mock(text="<html><script>x()</script><body><p>Precision sensors</p></body></html>")
+        
+        with patch('src.tools.scrape_website._HTTP') as mock_http:
+            mock_http.get.return_value = response
+            result = scraper._run('https://test-supplier.com')
+        
+        assert result == 'Precision sensors'
+        mock_http.get.assert_called_once_with('https://test-supplier.com')
 
 class TestSupplierDatabaseTool:
     """Test the supplier database tool functionality"""
     
     @pytest.fixture
     def db_tool(self):
-        """Create a test database tool instance"""
-        # Use temporary file for testing
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
-        temp_file.close()
+        """Create a test database tool backed by an in-memory SQLite database"""
+        tool = SupplierDatabaseTool(":memory:")
+        yield tool
+        tool.close()
+    
+    @pytest.fixture
+    def file_db_tool(self):
+        """Create a file-backed database tool (async actions open their own connections)"""
+        # Use temporary file for testing (pid-prefixed so xdist workers never collide)
+        fd, temp_path = tempfile.mkstemp(prefix=f"db_{os.getpid()}_", suffix='.db')
+        os.close(fd)
         
-        tool = SupplierDatabaseTool(temp_file.name)
+        tool = SupplierDatabaseTool(temp_path)
         yield tool
         
         # Cleanup
-        os.unlink(temp_file.name)
+        tool.close()
+        os.unlink(temp_path)
     
-    def test_initialization(self, db_tool):
+    def test_initialization(self, file_db_tool):
         """Test database tool initialization"""
-        assert db_tool.name == "supplier_database"
-        assert os.path.exists(db_tool.db_path)
+        assert file_db_tool.name == "supplier_database"
+        assert os.path.exists(file_db_tool.db_path)
     
-    def test_store_supplier(self, db_tool):
-        """Test storing supplier data"""
-        supplier_data = {
+    @pytest.mark.parametrize("supplier_data,query,expected", [
+        ({
             'name': 'Test Electronics Ltd',
             'website': 'https://test-electronics.com',
             'country': 'Germany',
             'product_categories': ['electronics', 'components'],
             'certifications': ['ISO9001', 'RoHS']
-        }
-        
-        result = db_tool._run('store', **supplier_data)
-        assert 'successfully' in result
-    
-    def test_search_suppliers(self, db_tool):
-        """Test searching for suppliers"""
-        # First store a supplier
-        supplier_data = {
+        }, None, 'successfully'),
+        ({
             'name': 'Search Test Supplier',
             'country': 'Japan',
             'product_categories': ['sensors']
-        }
-        db_tool._run('store', **supplier_data)
+        }, 'sensors', 'Search Test Supplier'),
+    ])
+    def test_store_and_search(self, db_tool, supplier_data, query, expected):
+        """Test storing supplier data and searching for it"""
+        result = db_tool._run('store', **supplier_data)
+        if query is not None:
+            result = db_tool._run('search', query=query)
+        
+        assert expected in result
+
+    def test_search_matches_word_prefixes(self, db_tool):
+        """Test full-text search on partial words across name and country"""
+        db_tool._run('store', name='Precision Optics GmbH', country='Germany')
+        
+        assert 'Precision Optics GmbH' in db_tool._run('search', query='optic germ')
+        assert 'No suppliers found' in db_tool._run('search', query='optic france')
+
+    def test_search_filters_by_country(self, db_tool):
+        """Test restricting a search to one country"""
+        db_tool._run('store', name='Osaka Sensors', country='Japan', product_categories=['sensors'])
+        db_tool._run('store', name='Berlin Sensors', country='Germany', product_categories=['sensors'])
+        
+        result = db_tool._run('search', query='sensors', country='Japan')
+        assert 'Osaka Sensors' in result
+        assert 'Berlin Sensors' not in result
+
+    def test_search_country_ignores_case(self, db_tool):
+        """Test that the country filter matches regardless of case"""
+        db_tool._run('store', name='Berlin Sensors', country='Germany', product_categories=['sensors'])
+        
+        assert 'Berlin Sensors' in db_tool._run('search', query='sensors', country='germany')
+        assert 'Berlin Sensors' in db_tool._run('search', query='', country='GERMANY')
+
+    def test_search_returns_json(self, db_tool):
+        """Test that search results are a JSON array of supplier records"""
+        db_tool._run('store', name='Kyoto Circuits', country='Japan', product_categories=['pcb'])
+        
+        results = json.loads(db_tool._run('search', query='kyoto'))
+        assert results == [{
+            'id': 1, 'name': 'Kyoto Circuits', 'website': None,
+            'country': 'Japan', 'product_categories': ['pcb']
+        }]
+
+    @pytest.mark.asyncio
+    async def test_async_search_raw(self, file_db_tool):
+        """Test that in-process callers get supplier dicts directly"""
+        file_db_tool._run('store', name='Kyoto Circuits', country='Japan')
+        
+        results = await file_db_tool._asearch_suppliers_raw('', country='Japan')
+        assert [r['name'] for r in results] == ['Kyoto Circuits']
+
+    def test_store_suppliers_bulk(self, db_tool):
+        """Test storing several suppliers in one transaction"""
+        rows = [
+            {'name': 'Bulk Supplier A', 'country': 'Japan'},
+            {'name': 'Bulk Supplier B', 'country': 'Korea'}
+        ]
+        
+        result = db_tool._run('store_bulk', rows=rows)
+        assert '2 suppliers stored successfully' in result
+        
+        # A failing row rolls back the whole batch
+        result = db_tool._run('store_bulk', rows=[{'name': 'Bulk Supplier C'}, {'country': 'Nowhere'}])
+        assert 'Error storing supplier' in result
+        assert 'Bulk Supplier C' not in db_tool._run('search', query='Bulk')
+
+    def test_update_supplier_merges_fields(self, db_tool):
+        """Test that an update changes only the given fields"""
+        db_tool._run('store', name='Merge Test GmbH', country='Germany', certifications=['ISO9001'])
+        
+        assert 'updated successfully' in db_tool._run('update', id=1, city='Munich')
+        details = db_tool._run('get', supplier_id=1)
+        assert 'Munich' in details and 'ISO9001' in details and 'Germany' in details
+        
+        assert 'Unknown supplier fields: rating' in db_tool._run('update', id=1, rating=5)
+        assert 'not found' in db_tool._run('update', id=99, city='Berlin')
+
+    def test_update_supplier_timestamps(self, db_tool):
+        """Test that created_at and updated_at can be set explicitly by an update"""
+        db_tool._run('store', name='Timestamp Test AG', country='Switzerland')
+        
+        result = db_tool._run('update', id=1, created_at='2020-01-01 00:00:00', updated_at='2020-06-01 00:00:00')
+        assert 'updated successfully' in result
+        timestamps = "SELECT created_at, updated_at FROM suppliers WHERE id = 1"
+        assert db_tool._conn.execute(timestamps).fetchone() == ('2020-01-01 00:00:00', '2020-06-01 00:00:00')
         
-        # Then search for it
-        result = db_tool._run('search', query='sensors')
-        assert 'Search Test Supplier' in result or 'No suppliers found' in result
+        # Updates without timestamps keep created_at and refresh updated_at
+        db_tool._run('update', id=1, city='Zurich')
+        created_at, updated_at = db_tool._conn.execute(timestamps).fetchone()
+        assert created_at == '2020-01-01 00:00:00'
+        assert updated_at > '2020-06-01 00:00:00'
+
+    def test_compressed_columns_round_trip(self, file_db_tool):
+        """Test that JSON columns are zstd-compressed once a dictionary is trained"""
+        pytest.importorskip('zstandard')
+        rows = [
+            {'name': f'Supplier {i}', 'contact_info': {'email': f'sales@supplier{i}.com', 'phone': f'+49 30 {i:04d}'}}
+            for i in range(100)
+        ]
+        file_db_tool._run('store_bulk', rows=rows)
+        
+        assert 'Trained' in file_db_tool.train_compression_dictionary()
+        file_db_tool._run('store', name='Compressed GmbH', contact_info={'email': 'sales@compressed.de', 'phone': '+49 30 9999'})
+        
+        stored_type = file_db_tool._conn.execute("SELECT typeof(contact_info) FROM suppliers WHERE id = 101").fetchone()[0]
+        assert stored_type == 'blob'
+        assert 'sales@compressed.de' in file_db_tool._run('get', supplier_id=101)
+        
+        # The dictionary lives in the database, so a fresh connection can decode the row
+        reopened = SupplierDatabaseTool(str(file_db_tool.db_path))
+        try:
+            assert 'sales@compressed.de' in reopened._run('get', supplier_id=101)
+        finally:
+            reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_async_store_and_search(self, file_db_tool):
+        """Test the aiosqlite-backed actions used from async agents"""
+        result = await file_db_tool._arun('store', name='Async Sensors KK', country='Japan')
+        assert 'successfully' in result
+        
+        assert 'Async Sensors KK' in await file_db_tool._arun('search', query='async')
+        assert 'updated successfully' in await file_db_tool._arun('update', id=1, city='Osaka')
+        assert 'Osaka' in file_db_tool._run('get', supplier_id=1)
 
 class TestConfig:
     """Test configuration management"""
     
-    def test_config_initialization(self):
-        """Test config initialization with environment variables"""
-        with patch.dict(os.environ, {
-            'OPENAI_API_KEY': 'test_openai_key',
-            'LOG_LEVEL': 'DEBUG',
-            'MAX_SUPPLIERS': '100'
-        }):
-            config = Config()
-            
-            assert config.openai_api_key == 'test_openai_key'
-            assert config.log_level == 'DEBUG'
-            assert config.max_suppliers == 100
-    
-    def test_config_validation(self):
-        """Test config validation"""
-        with patch.dict(os.environ, {}, clear=True):
-            with pytest.raises(ValueError):
-                Config()
-    
-    def test_config_properties(self):
-        """Test config property methods"""
-        with patch.dict(os.environ, {
-            'OPENAI_API_KEY': 'test_key',
-            'TAVILY_API_KEY': 'test_key'
-        }):
-            config = Config()
-            
-            assert config.has_openai is True
-            assert config.has_search_api is True
+    @pytest.fixture(autouse=True)
+    def _clean_env(self, monkeypatch):
+        """Start every test without API keys or settings from the real environment"""
+        for var in ('OPENAI_API_KEY', 'GOOGLE_API_KEY', 'TAVILY_API_KEY', 'SERPER_API_KEY',
+                    'LOG_LEVEL', 'CACHE_ENABLED', 'MAX_SUPPLIERS'):
+            monkeypatch.delenv(var, raising=False)
+    
+    @pytest.mark.parametrize("env,expected", [
+        (
+            {'OPENAI_API_KEY': 'test_openai_key', 'LOG_LEVEL': 'DEBUG', 'MAX_SUPPLIERS': '100'},
+            {'openai_api_key': 'test_openai_key', 'log_level': 'DEBUG', 'max_suppliers': 100}
+        ),
+        (
+            {'OPENAI_API_KEY': 'test_key', 'TAVILY_API_KEY': 'test_key'},
+            {'has_openai': True, 'has_search_api': True}
+        ),
+    ])
+    def test_config(self, env, expected, monkeypatch):
+        """Test config values and properties read from the environment"""
+        for var, value in env.items():
+            monkeypatch.setenv(var, value)
+        config = Config()
+        
+        for attr, value in expected.items():
+            assert getattr(config, attr) == value
+    
+    @pytest.mark.parametrize("env", [{}, {'TAVILY_API_KEY': 'test_key'}])
+    def test_config_missing_llm_key_raises(self, env, monkeypatch):
+        """Test config validation without any LLM API key"""
+        for var, value in env.items():
+            monkeypatch.setenv(var, value)
+        with pytest.raises(ValueError):
+            Config()
+
+    def test_get_config_is_cached(self, monkeypatch):
+        """Test that get_config parses the environment only once"""
+        monkeypatch.setenv('OPENAI_API_KEY', 'test_key')
+        get_config.cache_clear()
+        assert get_config() is get_config()
+        get_config.cache_clear()
+
+class TestReportWriter:
+    """Test the streaming report writer"""
+    
+    def test_write_report_round_trip(self, tmp_path):
+        """Test that a streamed report is valid JSON with all fields"""
+        path = tmp_path / "report.json"
+        suppliers = ({'name': f'Supplier {i}', 'score': i / 2} for i in range(3))
+        
+        write_report(path, {'total_suppliers': 3, 'overall_risk_level': 'LOW'}, suppliers)
+        
+        report = json.loads(path.read_text())
+        assert report['total_suppliers'] == 3
+        assert report['overall_risk_level'] == 'LOW'
+        assert [s['name'] for s in report['top_suppliers']] == ['Supplier 0', 'Supplier 1', 'Supplier 2']
+
+class TestTopSuppliers:
+    """Test picking the suppliers shown in the results table"""
+    
+    @pytest.mark.parametrize("scores,expected", [
+        ([5, 5, 5, 5, 5, 5, 5, 9, 1], [7, 0, 1, 2, 3]),
+        ([None] * 500, [0, 1, 2, 3, 4]),
+        ([2, 8, 4], [1, 2, 0]),
+    ])
+    def test_top_suppliers_keeps_report_order_for_ties(self, scores, expected):
+        """Test that the best scores come first and equal scores keep their report order"""
+        suppliers = [{'name': f'Supplier {i}', 'score': score} for i, score in enumerate(scores)]
+        
+        assert [s['name'] for s in _top_suppliers(suppliers)] == [f'Supplier {i}' for i in expected]
+
+class TestLLMCache:
+    """Test the persistent LLM response cache"""
+    
+    @pytest.fixture
+    def llm_cache(self, tmp_path):
+        """Create a small cache in a temporary directory"""
+        cache = LLMCache(str(tmp_path / "llm_cache.db"), max_entries=2)
+        yield cache
+        cache.close()
+    
+    def test_key_ignores_field_order(self):
+        """Test that equal requests hash to the same key"""
+        key = LLMCache.make_key("gpt-4", {'prompt': 'hi', 'temperature': 0.1})
+        assert key == LLMCache.make_key("gpt-4", {'temperature': 0.1, 'prompt': 'hi'})
+        assert key != LLMCache.make_key("gemini-pro", {'prompt': 'hi', 'temperature': 0.1})
+    
+    def test_get_respects_ttl(self, llm_cache):
+        """Test that stored responses expire after the TTL"""
+        llm_cache.set("k1", "response")
+        assert llm_cache.get("k1", ttl=60) == "response"
+        
+        llm_cache._conn.execute("UPDATE llm_cache SET ts = ts - 120")
+        assert llm_cache.get("k1", ttl=60) is None
+    
+    def test_hits_do_not_extend_ttl(self, llm_cache):
+        """Test that an entry read repeatedly still expires TTL seconds after it was stored"""
+        llm_cache.set("k1", "response")
+        llm_cache._conn.execute("UPDATE llm_cache SET ts = ts - 40, atime = atime - 120")
+        assert llm_cache.get("k1", ttl=60) == "response"
+        
+        llm_cache._conn.execute("UPDATE llm_cache SET ts = ts - 40")
+        assert llm_cache.get("k1", ttl=60) is None
+    
+    def test_evicts_least_recently_used(self, llm_cache):
+        """Test that entries beyond max_entries are evicted oldest first"""
+        llm_cache.set("k1", "one")
+        llm_cache.set("k2", "two")
+        llm_cache._conn.execute("UPDATE llm_cache SET atime = atime - 10 WHERE k = 'k1'")
+        llm_cache.set("k3", "three")
+        
+        assert llm_cache.get("k1") is None
+        assert llm_cache.get("k2") == "two"
+        assert llm_cache.get("k3") == "three"
+
+class TestSemanticCache:
+    """Test the semantic LLM cache"""
+    
+    def test_canonicalize_drops_filler(self):
+        """Test that wording noise is removed before embedding"""
+        assert canonicalize("Find suppliers for Electronic Components, please!") == "suppliers electronic components"
+    
+    @pytest.fixture
+    def semantic_cache(self, tmp_path):
+        """Create a cache on a bag-of-words stub embedding instead of a real model"""
+        pytest.importorskip('faiss')
+        
+        def embed(texts):
+            vectors = np.zeros((len(texts), 16), dtype=np.float32)
+            for row, text in enumerate(texts):
+                for word in text.split():
+                    vectors[row, sum(map(ord, word)) % 16] += 1
+            return vectors
+        
+        cache = SemanticCache(str(tmp_path / "semantic_cache.db"), model_name="stub", ttl=60,
+                              max_entries=3, embed=embed)
+        yield cache
+        cache.close()
+    
+    @pytest.mark.asyncio
+    async def test_ask_reuses_similar_prompt_in_same_scope(self, semantic_cache):
+        """Test that a reworded prompt hits, but only for the same scope"""
+        assert await semantic_cache.ask("Industrial sensors suppliers", AsyncMock(return_value="german list"), scope="germany") == "german list"
+        
+        call_llm = AsyncMock(return_value="fresh")
+        assert await semantic_cache.ask("suppliers for industrial sensors", call_llm, scope="germany") == "german list"
+        call_llm.assert_not_called()
+        
+        assert await semantic_cache.ask("suppliers for industrial sensors", call_llm, scope="france") == "fresh"
+        call_llm.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_ask_expires_and_evicts_entries(self, semantic_cache):
+        """Test that entries older than the TTL miss and the cache stays within max_entries"""
+        await semantic_cache.ask("industrial sensors suppliers", AsyncMock(return_value="old"), scope="germany")
+        semantic_cache._conn.execute("UPDATE semantic_cache SET ts = ts - 120")
+        
+        assert await semantic_cache.ask("industrial sensors suppliers", AsyncMock(return_value="new"), scope="germany") == "new"
+        
+        for category in ("valves", "pumps", "bearings"):
+            await semantic_cache.ask(f"{category} suppliers", AsyncMock(return_value=category), scope="germany")
+        assert semantic_cache._conn.execute("SELECT COUNT(*) FROM semantic_cache").fetchone()[0] == 3
+
+class TestPlanCache:
+    """Test the whole-run plan cache"""
+    
+    def test_round_trip_and_expiry(self, tmp_path):
+        """Test that run artifacts are returned until the TTL passes"""
+        cache = PlanCache(str(tmp_path / "plan_cache.db"), ttl=60)
+        key = PlanCache.make_key({'product_category': 'sensors', 'quality_standards': ['ISO9001']})
+        cache.set(key, {'suppliers': [{'name': 'Test Supplier'}], 'report': {'total_suppliers': 1}})
+        
+        assert cache.get(key)['report'] == {'total_suppliers': 1}
+        
+        cache._conn.execute("UPDATE plan_cache SET ts = ts - 120")
+        assert cache.get(key) is None
+        assert cache.get_suppliers(key) == [{'name': 'Test Supplier'}]
+        
+        # Storing another run prunes the expired one
+        cache.set(PlanCache.make_key({'product_category': 'valves'}), {'suppliers': []})
+        assert cache.get_suppliers(key) is None
+        cache.close()
 
 class TestIntegration:
     """Integration tests for the complete system"""
     
-    @pytest.mark.asyncio
-    async def test_end_to_end_workflow(self):
-        """Test complete sourcing workflow"""
-        with patch.dict(os.environ, {
-            'OPENAI_API_KEY': 'test_key',
-            'TAVILY_API_KEY': 'test_key'
-        }):
-            # Mock the entire workflow
-            with patch('src.crew_manager.SourcingCrewManager') as mock_manager:
-                manager_instance = Mock()
-                
-                # Mock each step of the workflow
-                manager_instance.research_suppliers = AsyncMock(return_value=[
+    @pytest.fixture
+    def crew_manager(self, monkeypatch):
+        """Replace the crew manager with an autospecced mock; autospec turns the async methods into AsyncMocks"""
+        monkeypatch.setenv('OPENAI_API_KEY', 'test_key')
+        monkeypatch.setenv('TAVILY_API_KEY', 'test_key')
+        with patch('src.crew_manager.SourcingCrewManager', autospec=True) as mock_manager:
+            manager = mock_manager.return_value
+            # Mock each step of the workflow in one pass
+            manager.configure_mock(**{
+                'use_cache': False,
+                'research_suppliers.return_value': [
                     {'name': 'Test Supplier', 'country': 'Germany'}
-                ])
-                manager_instance.analyze_suppliers = AsyncMock(return_value={
+                ],
+                'analyze_suppliers.return_value': {
                     'total_suppliers': 1,
                     'average_scores': {'quality': 8.5}
-                })
-                manager_instance.assess_risks = AsyncMock(return_value={
+                },
+                'assess_risks.return_value': {
                     'overall_risk_level': 'LOW'
-                })
-                manager_instance.generate_report = AsyncMock(return_value={
+                },
+                'generate_report.return_value': {
                     'executive_summary': 'Test report',
                     'total_suppliers': 1,
                     'recommended_count': 1
-                })
-                
-                mock_manager.return_value = manager_instance
-                
-                # Test the workflow
-                crew_manager = mock_manager()
-                
-                suppliers = await crew_manager.research_suppliers('test', 'Global')
-                analysis = await crew_manager.analyze_suppliers(suppliers, [])
-                risks = await crew_manager.assess_risks(suppliers)
-                report = await crew_manager.generate_report(
-                    suppliers, analysis, risks, 'test', '$10k', True
-                )
-                
-                assert len(suppliers) > 0
-                assert 'total_suppliers' in analysis
-                assert 'overall_risk_level' in risks
-                assert 'executive_summary' in report
+                }
+            })
+            yield manager
+    
+    @pytest.fixture
+    def sourcing_agent(self, crew_manager):
+        """Create the application's sourcing agent on top of the mocked crew manager"""
+        return SourcingAgent(use_cache=False)
+    
+    @pytest.mark.asyncio
+    async def test_end_to_end_workflow(self, sourcing_agent, crew_manager):
+        """Test complete sourcing workflow"""
+        report = await sourcing_agent.run_sourcing_analysis(
+            'test', '$10k', quality_standards=['ISO9001']
+        )
+        
+        suppliers = crew_manager.research_suppliers.return_value
+        assert report['executive_summary'] == 'Test report'
+        crew_manager.research_suppliers.assert_awaited_once_with('test', 'Global')
+        crew_manager.analyze_suppliers.assert_awaited_once_with(suppliers, ['ISO9001'])
+        crew_manager.assess_risks.assert_awaited_once_with(suppliers)
+        crew_manager.generate_report.assert_awaited_once_with(
+            suppliers, crew_manager.analyze_suppliers.return_value,
+            crew_manager.assess_risks.return_value, 'test', '$10k', True
+        )
+
+    @pytest.fixture
+    def speculator(self, sourcing_agent, crew_manager):
+        """Give the agent a previous run to speculate on, returning the forked manager that analyzes it"""
+        sourcing_agent.plan_cache = Mock()
+        sourcing_agent.plan_cache.get.return_value = None
+        sourcing_agent.plan_cache.get_suppliers.return_value = [{'name': 'Test Supplier', 'country': 'France'}]
+        
+        speculator = Mock()
+        crew_manager.fork.return_value = speculator
+        return speculator
+    
+    @pytest.mark.asyncio
+    async def test_changed_suppliers_skip_speculation(self, sourcing_agent, crew_manager, speculator):
+        """Test that a supplier list differing from the previous one is analyzed without waiting on speculation"""
+        async def never_finish(*args):
+            await asyncio.Event().wait()
+        
+        # Same name, different details; speculation never finishes
+        speculator.analyze_suppliers = AsyncMock(side_effect=never_finish)
+        speculator.assess_risks = AsyncMock(side_effect=never_finish)
+        
+        report = await asyncio.wait_for(sourcing_agent.run_sourcing_analysis('test', '$10k'), timeout=5)
+        
+        assert report['executive_summary'] == 'Test report'
+        crew_manager.analyze_suppliers.assert_awaited_once_with(crew_manager.research_suppliers.return_value, [])
+    
+    @pytest.mark.asyncio
+    async def test_failed_research_discards_speculation(self, sourcing_agent, crew_manager, speculator):
+        """Test that speculation is cancelled and its errors retrieved when research fails"""
+        async def fail(*args):
+            await asyncio.sleep(0.01)
+            raise RuntimeError("research failed")
+        
+        crew_manager.research_suppliers.side_effect = fail
+        speculator.analyze_suppliers = AsyncMock(side_effect=ValueError("speculation failed"))
+        speculator.assess_risks = AsyncMock(return_value={})
+        
+        loop = asyncio.get_running_loop()
+        errors = []
+        previous_handler = loop.get_exception_handler()
+        loop.set_exception_handler(lambda loop, context: errors.append(context))
+        try:
+            with pytest.raises(RuntimeError):
+                await sourcing_agent.run_sourcing_analysis('test', '$10k')
+            await asyncio.sleep(0)
+            gc.collect()
+        finally:
+            loop.set_exception_handler(previous_handler)
+        
+        assert errors == []
 
 # Performance Tests
 class TestPerformance:
@@ -284,11 +758,11 @@ class TestPerformance:
             assert len(results) == 5
             assert all('Mock result' in result for result in results)
 
-# Fixtures for test data
-@pytest.fixture
+# Fixtures for test data (read-only, so built once per session; copy before mutating)
+@pytest.fixture(scope="session")
 def sample_supplier_data():
     """Sample supplier data for testing"""
-    return {
+    return types.MappingProxyType({
         'name': 'Global Tech Solutions',
         'website': 'https://globaltech.com',
         'country': 'Singapore',
@@ -304,12 +778,12 @@ def sample_supplier_data():
             'design': True,
             'testing': True
         }
-    }
+    })
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_evaluation_criteria():
     """Sample evaluation criteria for testing"""
-    return [
+    return (
         'Quality Standards',
         'Financial Stability',
         'Delivery Performance',
@@ -318,7 +792,7 @@ def sample_evaluation_criteria():
         'Innovation',
         'Sustainability',
         'Risk Profile'
-    ]
+    )
 
 # Test utilities
 def create_mock_llm_response(content: str):
@@ -329,14 +803,14 @@ def create_mock_llm_response(content: str):
 
 def create_mock_search_results(count: int = 3):
     """Create mock search results for testing"""
-    results = []
-    for i in range(count):
-        results.append({
-            'title': f'Test Supplier {i+1}',
-            'url': f'https://supplier{i+1}.com',
-            'snippet': f'Description of supplier {i+1}'
-        })
-    return results
+    return [
+        {
+            'title': f'Test Supplier {i}',
+            'url': f'https://supplier{i}.com',
+            'snippet': f'Description of supplier {i}'
+        }
+        for i in range(1, count + 1)
+    ]
 
 # Parameterized tests
 @pytest.mark.parametrize("product_category,expected_min_suppliers", [
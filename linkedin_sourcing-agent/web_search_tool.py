@@ -6,11 +6,46 @@ Provides web search capabilities for the AI agents.
 """
 
 import asyncio
+import atexit
+import threading
 import aiohttp
-from typing import List, Dict, Optional
+from collections import OrderedDict
+from typing import ClassVar, List, Dict, Optional
 from crewai_tools import BaseTool
 import json
 
+try:
+    from duckduckgo_search import DDGS
+except ImportError:
+    DDGS = None
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """Return the long-lived event loop that runs synchronous tool calls, starting it on first use"""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="web-search-loop", daemon=True).start()
+            atexit.register(_loop.call_soon_threadsafe, _loop.stop)
+    return _loop
+
+def _dedupe_by_url(results) -> List[Dict]:
+    """Keep the first result for each URL (case and trailing slash ignored), preserving order"""
+    seen = set()
+    unique = []
+    for result in results:
+        url = (result.get('url') or '').lower().rstrip('/')
+        # Results without a URL cannot be matched up, so all of them are kept
+        if url:
+            if url in seen:
+                continue
+            seen.add(url)
+        unique.append(result)
+    return unique
+
 class WebSearchTool(BaseTool):
     """
     Custom web search tool that aggregates results from multiple search engines
@@ -19,9 +54,24 @@ class WebSearchTool(BaseTool):
     name: str = "web_search"
     description: str = "Search the web for information about suppliers, companies, and market data"
 
+    SEARCH_CACHE_SIZE: ClassVar[int] = 256
+    SUPPLIER_QUERY_TEMPLATES: ClassVar[tuple] = (
+        "{category} suppliers {location}",
+        "{category} manufacturers {location}",
+        "{category} distributors {location}",
+        "wholesale {category} {location}",
+    )
+
     def __init__(self):
         super().__init__()
         self.session = None
+        # DDGS keeps per-client request state and is not thread-safe: one per worker thread
+        self.ddgs_clients = threading.local()
+        self.search_cache = OrderedDict()
+
+    def cache_clear(self):
+        """Drop all cached search results"""
+        self.search_cache.clear()
 
     async def _get_session(self):
         """Get or create aiohttp session"""
@@ -29,55 +79,81 @@ class WebSearchTool(BaseTool):
             self.session = aiohttp.ClientSession()
         return self.session
 
+    def _get_ddgs(self):
+        """Get or create the calling thread's DuckDuckGo client, reusing its HTTP connection across queries"""
+        ddgs = getattr(self.ddgs_clients, 'client', None)
+        if ddgs is None:
+            ddgs = self.ddgs_clients.client = DDGS()
+        return ddgs
+
     def _run(self, query: str, max_results: int = 10) -> str:
         """
         Synchronous search method (required by CrewAI)
         """
-        return asyncio.run(self._search_async(query, max_results))
+        # Reuse one loop (and its open sessions) across calls instead of
+        # building and tearing down a new loop with asyncio.run each time
+        future = asyncio.run_coroutine_threadsafe(
+            self._search_async(query, max_results), _background_loop()
+        )
+        return future.result()
 
     async def _search_async(self, query: str, max_results: int = 10) -> str:
         """
         Perform asynchronous web search
         """
-        try:
-            results = []
+        # Agents retry near-identical lookups; serve repeats from memory
+        key = (query.strip().lower(), max_results)
+        if key in self.search_cache:
+            self.search_cache.move_to_end(key)
+            return self.search_cache[key]
 
+        try:
             # Try DuckDuckGo search first (no API key required)
             ddg_results = await self._search_duckduckgo(query, max_results)
-            results.extend(ddg_results)
+            results = _dedupe_by_url(ddg_results)[:max_results]
 
             # Format results for agent consumption
-            formatted_results = []
-            for i, result in enumerate(results[:max_results], 1):
-                formatted_results.append(f"""
+            formatted = "\n".join(
+                f"""
 {i}. {result.get('title', 'No title')}
    URL: {result.get('url', 'No URL')}
    Snippet: {result.get('snippet', 'No snippet')}
-""")
-
-            return "\n".join(formatted_results)
+"""
+                for i, result in enumerate(results, 1)
+            )
 
         except Exception as e:
             return f"Search failed: {str(e)}"
 
+        # Empty output usually means the search itself failed; don't pin it
+        if formatted:
+            self.search_cache[key] = formatted
+            if len(self.search_cache) > self.SEARCH_CACHE_SIZE:
+                self.search_cache.popitem(last=False)
+        return formatted
+
     async def _search_duckduckgo(self, query: str, max_results: int) -> List[Dict]:
         """
         Search using DuckDuckGo (no API key required)
         """
-        try:
-            from duckduckgo_search import DDGS
-
-            ddgs = DDGS()
-            results = []
+        if DDGS is None:
+            return []
 
-            for result in ddgs.text(query, max_results=max_results):
-                results.append({
+        try:
+            # DDGS is synchronous; run it on a worker thread so concurrent
+            # queries don't block the event loop for each round-trip
+            raw_results = await asyncio.to_thread(
+                lambda: list(self._get_ddgs().text(query, max_results=max_results))
+            )
+
+            return [
+                {
                     'title': result.get('title', ''),
                     'url': result.get('href', ''),
                     'snippet': result.get('body', '')
-                })
-
-            return results
+                }
+                for result in raw_results
+            ]
 
         except Exception as e:
             print(f"DuckDuckGo search failed: {e}")
@@ -86,23 +162,38 @@ class WebSearchTool(BaseTool):
     async def search_suppliers(self, product_category: str, location: str = "") -> List[Dict]:
         """
         Specialized method for searching suppliers
+
+        Returns the raw result dicts (title, url, snippet), deduplicated by URL,
+        rather than the formatted text of _run. Queries go straight to
+        DuckDuckGo and bypass the _search_async result cache.
         """
         location_filter = f"in {location}" if location else ""
         queries = [
-            f"{product_category} suppliers {location_filter}",
-            f"{product_category} manufacturers {location_filter}",
-            f"{product_category} distributors {location_filter}",
-            f"wholesale {product_category} {location_filter}"
+            template.format(category=product_category, location=location_filter)
+            for template in self.SUPPLIER_QUERY_TEMPLATES
         ]
 
-        all_results = []
-        for query in queries:
-            results = await self._search_async(query, 5)
-            all_results.append(results)
+        # Issue all queries at once so total latency is the slowest query, not the sum
+        batches = await asyncio.gather(
+            *(self._search_duckduckgo(query, 5) for query in queries),
+            return_exceptions=True
+        )
+
+        # The query variants overlap heavily; keep each supplier URL once
+        return _dedupe_by_url(
+            result
+            for batch in batches if not isinstance(batch, BaseException)
+            for result in batch
+        )
+
+    async def aclose(self):
+        """Close the HTTP session, if one was opened"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
 
-        return all_results
+    async def __aenter__(self):
+        return self
 
-    def __del__(self):
-        """Cleanup session when object is destroyed"""
-        if self.session:
-            asyncio.create_task(self.session.close())
+    async def __aexit__(self, *exc_info):
+        await self.aclose()